@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from evaluation_parser import parse_batch_evaluation
+
+# Endpoint named in each line of a provider batch input file
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+_export_lock = threading.Lock()
+
+
+class EvaluationBatch:
+    """
+    Buffers framework snapshots until `size` of them can be scored with one evaluator request.
+
+    Turns that reused the previous evaluation are buffered too (with a snapshot of None)
+    while snapshots are waiting, so the results can be applied to the history in turn order.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.entries: List[Tuple[int, Optional[Dict[str, Any]]]] = []
+        self.batches = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered snapshots waiting for an evaluation."""
+        return sum(1 for _, snapshot in self.entries if snapshot is not None)
+
+    @property
+    def is_full(self) -> bool:
+        """True once `size` snapshots are waiting and the batch should be flushed."""
+        return self.pending >= self.size
+
+    def add(self, turn: int, snapshot: Optional[Dict[str, Any]]) -> None:
+        """Buffer the snapshot of `turn` (None for a turn that needs no evaluation)."""
+        self.entries.append((turn, snapshot))
+
+    def take(self) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Return the buffered (turn, snapshot) pairs in turn order and empty the buffer."""
+        entries, self.entries = self.entries, []
+        if any(snapshot is not None for _, snapshot in entries):
+            self.batches += 1
+        return entries
+
+
+def batch_request_line(custom_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap a chat completion request as one line of a provider batch input file."""
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": request}
+
+
+def append_batch_request(path: str, custom_id: str, request: Dict[str, Any]) -> None:
+    """Append a chat completion request to the batch input file at `path`."""
+    line = json.dumps(batch_request_line(custom_id, request), ensure_ascii=False)
+    with _export_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def batch_turns(custom_id: str) -> List[int]:
+    """Return the turns listed in the custom_id of an exported evaluation batch ("turns-3-5-9")."""
+    prefix, _, turns = custom_id.partition("-")
+    if prefix != "turns" or not turns:
+        raise ValueError(f"Not an evaluation batch custom_id: {custom_id!r}")
+    return [int(turn) for turn in turns.split("-")]
+
+
+def _completion_body(completion) -> Dict[str, Any]:
+    """Convert a completion object to the JSON body a provider returns for a batch line."""
+    usage = getattr(completion, "usage", None)
+    return {
+        "id": getattr(completion, "id", None),
+        "object": "chat.completion",
+        "model": getattr(completion, "model", None),
+        "choices": [
+            {
+                "index": choice.index,
+                "message": {"role": "assistant", "content": choice.message.content},
+                "finish_reason": choice.finish_reason,
+            }
+            for choice in completion.choices
+        ],
+        "usage": {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+            "total_tokens": getattr(usage, "total_tokens", 0),
+        },
+    }
+
+
+def replay_batch_file(input_path: str, output_path: str, client) -> Dict[str, int]:
+    """
+    Run every request of a batch input file through `client` and write a batch output file.
+
+    The output uses the provider's batch output format, so it can be read by
+    `load_batch_results()` just like the file downloaded from a real batch job.
+
+    Args:
+    input_path (str): Batch input JSONL, as written by `append_batch_request()`.
+    output_path (str): Path of the batch output JSONL to write.
+    client: Client with an OpenAI-compatible `chat.completions.create`, e.g. the mock backend.
+
+    Returns:
+    Dict[str, int]: Number of completed and failed requests.
+    """
+    counts = {"completed": 0, "failed": 0}
+    with open(input_path, "r", encoding="utf-8") as source, open(output_path, "w", encoding="utf-8") as target:
+        for index, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            result = {"id": f"batch_req_{index}", "custom_id": request["custom_id"], "response": None, "error": None}
+            try:
+                completion = client.chat.completions.create(**request["body"])
+                result["response"] = {"status_code": 200, "body": _completion_body(completion)}
+                counts["completed"] += 1
+            except Exception as e:
+                result["error"] = {"code": type(e).__name__, "message": str(e)}
+                counts["failed"] += 1
+            target.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return counts
+
+
+def load_batch_results(path: str) -> Dict[int, Tuple[Dict[str, float], float]]:
+    """
+    Read the per-turn evaluations from a batch output file.
+
+    Args:
+    path (str): Batch output JSONL from a provider batch job or `replay_batch_file()`.
+
+    Returns:
+    Dict[int, Tuple[Dict[str, float], float]]: The metrics and political leaning of every
+    turn that received a valid evaluation.
+    """
+    results = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            text = response["body"]["choices"][0]["message"]["content"] or ""
+            turns = batch_turns(result["custom_id"])
+            try:
+                results.update(parse_batch_evaluation(text, {turn: 0.0 for turn in turns}))
+            except ValueError:
+                continue
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay exported evaluation batches and read their results.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay = subparsers.add_parser("replay", help="Answer a batch input file with a local backend.")
+    replay.add_argument("input", help="Batch input JSONL exported by a run.")
+    replay.add_argument("--output", help="Batch output JSONL to write. Defaults to <input>.results.jsonl.")
+    replay.add_argument("--backend", default=os.getenv("LLM_BACKEND", "mock"), help="LLM backend that answers the requests.")
+    show = subparsers.add_parser("show", help="Print the per-turn evaluations of a batch output file.")
+    show.add_argument("results", help="Batch output JSONL.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.command == "replay":
+        from llm_backends import create_client
+
+        output_path = args.output or os.path.splitext(args.input)[0] + ".results.jsonl"
+        counts = replay_batch_file(args.input, output_path, create_client(args.backend))
+        print(f"Replayed {counts['completed']} requests ({counts['failed']} failed) into {output_path}")
+        results_path = output_path
+    else:
+        results_path = args.results
+
+    for turn, (metrics, leaning) in sorted(load_batch_results(results_path).items()):
+        print(f"Turn {turn}: metrics {metrics}, leaning {leaning}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
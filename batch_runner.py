@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import optimal_politics_swarm as politics_swarm
+from optimal_politics_swarm import RunConfig
+from run_logging import get_logger
+
+log = get_logger("batch")
+
+
+def build_grid(temperatures: List[float], turns: List[int], seeds: List[Optional[int]], models: List[str], output_root: str) -> List[RunConfig]:
+    """
+    Expand the temperature × turns × seed × model grid into run configurations.
+
+    Each configuration writes into its own directory under `output_root`, so the
+    `summary.txt`, results file and graph of one run never overwrite another's.
+
+    Args:
+    temperatures (List[float]): Sampling temperatures to test.
+    turns (List[int]): MAX_TURNS values to test.
+    seeds (List[Optional[int]]): Seeds passed to the completion API (None for unseeded).
+    models (List[str]): Model names to test.
+    output_root (str): Directory that receives one sub-directory per configuration.
+
+    Returns:
+    List[RunConfig]: One configuration per grid point.
+    """
+    configs = []
+    for model, max_turns, temperature, seed in itertools.product(models, turns, temperatures, seeds):
+        name = f"{model}_turns{max_turns}_temp{temperature}" + (f"_seed{seed}" if seed is not None else "")
+        configs.append(RunConfig(
+            temperature=temperature,
+            max_turns=max_turns,
+            model=model,
+            seed=seed,
+            output_dir=os.path.join(output_root, name)
+        ))
+    return configs
+
+
+def _run_isolated(config: RunConfig, resume: bool = False) -> float:
+    """Run `main()` for one configuration with its log records kept out of the console (they go to its run.log)."""
+    started = time.monotonic()
+    politics_swarm.main(config, resume=resume, console_log=False)
+    return time.monotonic() - started
+
+
+async def run_batch(configs: List[RunConfig], concurrency: int = 4, resume: bool = False) -> List[Optional[BaseException]]:
+    """
+    Run several simulations concurrently in this process.
+
+    The Swarm client is synchronous, so every run executes `main()` unchanged on a worker
+    thread while the event loop caps how many runs are in flight at once.
+
+    Args:
+    configs (List[RunConfig]): The runs to execute.
+    concurrency (int): Maximum number of runs (and therefore in-flight API requests) at once.
+    resume (bool): Continue each run from its latest checkpoint, if it has one.
+
+    Returns:
+    List[Optional[BaseException]]: For each configuration, None on success or the error raised.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+
+    async def run_one(config: RunConfig) -> Optional[BaseException]:
+        async with semaphore:
+            log.info("Starting run in %s", config.output_dir)
+            try:
+                elapsed = await asyncio.to_thread(_run_isolated, config, resume)
+            except Exception as e:
+                log.exception("Run in %s failed: %s", config.output_dir, e)
+                return e
+            log.info("Finished run in %s (%.1fs)", config.output_dir, elapsed)
+            return None
+
+    return await asyncio.gather(*(run_one(config) for config in configs))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a grid of swarm simulations concurrently.")
+    parser.add_argument("--temperatures", type=float, nargs="+", default=[politics_swarm.OPENAI_TEMPERATURE])
+    parser.add_argument("--turns", type=int, nargs="+", default=[politics_swarm.MAX_TURNS])
+    parser.add_argument("--seeds", type=int, nargs="+", default=None)
+    parser.add_argument("--models", nargs="+", default=[politics_swarm.OPENAI_MODEL])
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of runs executing at once.")
+    parser.add_argument("--output-dir", default="sweeps", help="Directory receiving one sub-directory per run.")
+    parser.add_argument("--resume", action="store_true", help="Continue interrupted runs from their latest checkpoints.")
+    politics_swarm.add_debug_argument(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    politics_swarm.configure_logging(args.debug)
+    configs = build_grid(args.temperatures, args.turns, args.seeds or [None], args.models, args.output_dir)
+    log.info("Running %d configurations with concurrency %d...", len(configs), args.concurrency)
+    results = asyncio.run(run_batch(configs, args.concurrency, args.resume))
+    failures = sum(1 for result in results if result is not None)
+    log.info("Batch finished: %d succeeded, %d failed.", len(configs) - failures, failures)
+
+    # Consolidated statistics over every run of the sweep (finished or not)
+    from run_analysis import write_report
+    report_prefix = os.path.join(args.output_dir, "analysis_report")
+    if write_report([args.output_dir], report_prefix):
+        log.info("Analysis of all runs written to %s.txt and %s.json", report_prefix, report_prefix)
+        from plotting import main as plot_overlay_main
+        plot_overlay_main([args.output_dir, "--output", os.path.join(args.output_dir, "leaning_overlay.png")])
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
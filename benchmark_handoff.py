@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+os.environ.setdefault("LLM_BACKEND", "mock")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+import optimal_politics_swarm as politics_swarm
+from context_window import count_tokens
+from routed_swarm import RoutedSwarm
+
+HANDOFF_MODES = ["mesh", "routed"]
+
+
+def schema_tokens(handoff_mode: str, model: str = politics_swarm.OPENAI_MODEL) -> dict:
+    """
+    Count the prompt tokens the tool schema adds to each agent's requests.
+
+    Args:
+    handoff_mode (str): "mesh" or "routed".
+    model (str): Model whose tokenizer is used for counting.
+
+    Returns:
+    dict: Tool count and schema tokens per agent, keyed by agent name.
+    """
+    agents = politics_swarm.build_agents(handoff_mode)
+    swarm_client = RoutedSwarm(client=politics_swarm.get_client())
+    return {
+        name: {"tools": len(agent.functions), "tokens": count_tokens(json.dumps(swarm_client.tools_for(agent)), model)}
+        for name, agent in agents.items()
+    }
+
+
+def run_prompt_tokens(handoff_mode: str, turns: int) -> float:
+    """Run the simulation on the mock backend and return the mean prompt tokens of the agent requests."""
+    politics_swarm._agents = politics_swarm.build_agents(handoff_mode)
+    with tempfile.TemporaryDirectory(prefix="politics_handoff_") as output_dir:
+        config = politics_swarm.RunConfig(max_turns=turns, seed=0, output_dir=output_dir)
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                politics_swarm.main(config)
+            finally:
+                sys.stdout = stdout
+        with open(config.call_stats_path, "r", encoding="utf-8") as f:
+            calls = json.load(f)["calls"]
+    agent_calls = [call for call in calls if call["call_site"].startswith("agent:")]
+    return statistics.fmean(call["prompt_tokens"] for call in agent_calls)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the prompt tokens of the mesh and routed handoff modes.")
+    parser.add_argument("--turns", type=int, default=0, help="Also simulate this many turns per mode on the mock backend.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    schemas = {mode: schema_tokens(mode) for mode in HANDOFF_MODES}
+
+    print(f"{'Agent':<32} {'Mesh tools':>10} {'Mesh tok':>9} {'Routed tools':>12} {'Routed tok':>10} {'Saved tok':>9}")
+    for name in schemas["mesh"]:
+        mesh, routed = schemas["mesh"][name], schemas["routed"][name]
+        print(f"{name:<32} {mesh['tools']:>10} {mesh['tokens']:>9} {routed['tools']:>12} {routed['tokens']:>10} {mesh['tokens'] - routed['tokens']:>9}")
+    means = {mode: statistics.fmean(agent["tokens"] for agent in schemas[mode].values()) for mode in HANDOFF_MODES}
+    print(f"\nMean tool-schema tokens per agent request: mesh {means['mesh']:.0f}, routed {means['routed']:.0f} "
+          f"({1 - means['routed'] / means['mesh']:.0%} fewer)")
+
+    if args.turns:
+        prompts = {mode: run_prompt_tokens(mode, args.turns) for mode in HANDOFF_MODES}
+        print(f"Mean prompt tokens per agent request over {args.turns} simulated turns: "
+              f"mesh {prompts['mesh']:.0f}, routed {prompts['routed']:.0f} (saved {prompts['mesh'] - prompts['routed']:.0f} per turn)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["matplotlib", "openai", "swarm", "tiktoken"]
+
+# Runs in a fresh interpreter. Stage "import" only imports the module; stage "eager" then
+# also creates everything the module used to create at import time (client, agents,
+# pyplot), which is the startup cost a plain import paid before construction was deferred.
+_PROBE = """
+import json, sys, time, tracemalloc
+trace = sys.argv[2] == "1"
+if trace:
+    tracemalloc.start()
+started = time.perf_counter()
+import optimal_politics_swarm as politics_swarm
+if sys.argv[1] == "eager":
+    politics_swarm.get_client()
+    politics_swarm.get_agents()
+    import matplotlib.pyplot
+elapsed = time.perf_counter() - started
+result = {"seconds": elapsed, "loaded": [name for name in %r if name in sys.modules]}
+if trace:
+    result["kib"] = tracemalloc.get_traced_memory()[0] / 1024
+print(json.dumps(result))
+""" % HEAVY_MODULES
+
+
+def _probe(stage: str, trace_memory: bool) -> dict:
+    # The mock backend lets the client be created without an API key
+    env = dict(os.environ, LLM_BACKEND=os.environ.get("LLM_BACKEND", "mock"), MPLBACKEND="Agg")
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, stage, "1" if trace_memory else "0"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark(stage: str, repeats: int = 5) -> dict:
+    """
+    Measure the startup time and memory of one stage in fresh interpreters.
+
+    Args:
+    stage (str): "import" for a bare import, "eager" for an import followed by creating
+        the client, the agents and pyplot.
+    repeats (int): Number of timed interpreter starts; the median is reported.
+
+    Returns:
+    dict: Median seconds, traced memory in KiB and the heavy modules that were loaded.
+    """
+    timings = [_probe(stage, trace_memory=False) for _ in range(repeats)]
+    traced = _probe(stage, trace_memory=True)
+    return {
+        "stage": stage,
+        "median_ms": round(statistics.median(timing["seconds"] for timing in timings) * 1000, 1),
+        "memory_kib": round(traced["kib"], 1),
+        "loaded": timings[0]["loaded"],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the import time and memory of optimal_politics_swarm.")
+    parser.add_argument("--repeats", type=int, default=5, help="Interpreter starts per stage.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = [benchmark("import", args.repeats), benchmark("eager", args.repeats)]
+    print(f"{'Stage':<8} {'Median ms':>10} {'Memory KiB':>11}  Heavy modules loaded")
+    for result in results:
+        print(f"{result['stage']:<8} {result['median_ms']:>10} {result['memory_kib']:>11}  {', '.join(result['loaded']) or '-'}")
+    print(json.dumps(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import argparse
+import contextlib
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# The benchmark measures the orchestration loop itself, so it runs against the offline
+# mock backend and without the response cache
+os.environ.setdefault("LLM_BACKEND", "mock")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+import optimal_politics_swarm as politics_swarm
+from optimal_politics_swarm import RunConfig
+from run_journal import load_journal
+
+DEFAULT_TURNS = [100, 1000, 10000]
+
+
+def _run(config: RunConfig, trace_memory: bool):
+    """Run `main()` once with its output discarded and return the wall time and memory figures."""
+    memory = {}
+    if trace_memory:
+        tracemalloc.start()
+        memory["start_bytes"] = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        politics_swarm.main(config, console_log=False)
+    wall_time = time.perf_counter() - started
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory.update(end_bytes=current, peak_bytes=peak, growth_bytes=current - memory["start_bytes"])
+    return wall_time, memory
+
+
+def benchmark(turns: int, seed: int = 0, trace_memory: bool = True) -> dict:
+    """
+    Measure the orchestration loop of `main()` for a run of the given length.
+
+    The timing pass runs untraced; memory is measured in a second pass under tracemalloc,
+    which slows Python down too much to be timed.
+
+    Args:
+    turns (int): Number of turns to simulate.
+    seed (int): Run seed, forwarded to the mock backend requests.
+    trace_memory (bool): Also measure memory growth in a second, traced pass.
+
+    Returns:
+    dict: Throughput, per-turn latency and overhead figures, and the memory figures.
+    """
+    with tempfile.TemporaryDirectory(prefix="politics_bench_") as output_dir:
+        config = RunConfig(max_turns=turns, seed=seed, output_dir=output_dir)
+        wall_time, _ = _run(config, trace_memory=False)
+
+        turn_records, _ = load_journal(config.journal_path)
+        latencies = sorted(record["latency"] for record in turn_records)
+        with open(config.call_stats_path, "r", encoding="utf-8") as f:
+            calls = json.load(f)["calls"]
+        completion_time = sum(call["wall_time"] for call in calls)
+
+    result = {
+        "turns": turns,
+        "wall_time": round(wall_time, 3),
+        "turns_per_second": round(turns / wall_time, 2),
+        "turn_latency_mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "turn_latency_p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3),
+        "completion_calls": len(calls),
+        # Time spent outside the (mock) completion calls: Swarm, context handling, journal, evaluations bookkeeping
+        "overhead_per_turn_ms": round(max(0.0, sum(latencies) - completion_time) / turns * 1000, 3),
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+    if trace_memory:
+        with tempfile.TemporaryDirectory(prefix="politics_bench_") as output_dir:
+            _, memory = _run(RunConfig(max_turns=turns, seed=seed, output_dir=output_dir), trace_memory=True)
+        result.update(
+            memory_growth_kib=round(memory["growth_bytes"] / 1024, 1),
+            memory_peak_kib=round(memory["peak_bytes"] / 1024, 1),
+            memory_growth_per_1000_turns_kib=round(memory["growth_bytes"] / 1024 / turns * 1000, 1),
+        )
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the orchestration loop against the offline mock backend.")
+    parser.add_argument("--turns", type=int, nargs="+", default=DEFAULT_TURNS, help="Run lengths to benchmark.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the simulated runs.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced memory pass.")
+    parser.add_argument("--output", help="Also write the results as JSON to this file.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = []
+    for turns in args.turns:
+        result = benchmark(turns, seed=args.seed, trace_memory=not args.no_memory)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    print(f"\n{'Turns':>7} {'Turns/s':>9} {'Mean ms':>9} {'p95 ms':>9} {'Overhead ms':>12} {'Mem growth KiB':>15}")
+    for result in results:
+        growth = result.get("memory_growth_kib", "n/a")
+        print(f"{result['turns']:>7} {result['turns_per_second']:>9} {result['turn_latency_mean_ms']:>9} "
+              f"{result['turn_latency_p95_ms']:>9} {result['overhead_per_turn_ms']:>12} {growth:>15}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
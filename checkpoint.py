@@ -0,0 +1,50 @@
+import json
+import os
+from typing import Any, Dict, Optional
+
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """
+    Atomically write a run checkpoint.
+
+    The state is written to a temporary file, synced to disk and then renamed over the
+    previous checkpoint, so a crash while saving never leaves a truncated checkpoint.
+
+    Args:
+    path (str): Location of the checkpoint file.
+    state (Dict[str, Any]): JSON-serializable run state.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(state, version=CHECKPOINT_VERSION), f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a run checkpoint.
+
+    Args:
+    path (str): Location of the checkpoint file.
+
+    Returns:
+    Optional[Dict[str, Any]]: The saved state, or None if there is no checkpoint.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')} in {path}.")
+    return state
+
+
+def truncate_file(path: str, size: int) -> None:
+    """Cut an append-only output file back to `size` bytes, discarding what was written after a checkpoint."""
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        with open(path, "r+b") as f:
+            f.truncate(size)
@@ -0,0 +1,167 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+# Per-message formatting overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+HISTORY_NOTE_PREFIX = "[Summary of the earlier conversation]"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    # tiktoken is imported on first use; it is optional and slow to import
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+    except Exception:
+        # The encoding files could not be loaded (e.g. offline); fall back to estimation
+        return None
+
+
+@lru_cache(maxsize=16384)
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    Count the tokens of `text` locally.
+
+    Uses tiktoken when it is installed and falls back to a characters-per-token estimate
+    otherwise. Results are memoized because the same messages are counted on every turn.
+
+    Args:
+    text (str): The text to count.
+    model (str): The model whose tokenizer should be used.
+
+    Returns:
+    int: The (possibly estimated) number of tokens.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_tokens(message: Dict[str, Any], model: str = "gpt-4o-mini") -> int:
+    """Return the approximate prompt tokens a chat message contributes, including its tool calls."""
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(message.get("content") or "", model)
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function", {})
+        tokens += count_tokens(function.get("name", ""), model) + count_tokens(function.get("arguments", ""), model)
+    return tokens
+
+
+def group_messages(messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Split a history into groups that must be kept or dropped together.
+
+    An assistant message that requests tool calls is grouped with the tool results that
+    answer it, because the API rejects a tool result without its call and vice versa.
+    Every other message forms a group of its own.
+    """
+    groups = []
+    for message in messages:
+        if message.get("role") == "tool" and groups and (groups[-1][0].get("tool_calls")):
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+
+class ContextWindow:
+    """
+    Keeps the conversation history under a prompt token budget.
+
+    The first `pinned` messages (the task statement) are always kept. Once the history
+    exceeds the budget, the newest messages are kept whole, as tool call/result groups,
+    until `trim_to` of the budget is used. Anything older is evicted and replaced by a
+    single note carrying the rolling summaries of the conversation, which already cover
+    the evicted turns.
+
+    Trimming below the budget leaves room for the next turns, so the history is only
+    trimmed every few turns rather than on every turn once it is full. In between, the
+    history (note included) only grows at the end, and the provider's prompt-prefix cache
+    can keep serving everything up to the newest messages.
+    """
+
+    def __init__(self, max_tokens: int, model: str = "gpt-4o-mini", pinned: int = 1, trim_to: float = 0.75):
+        """
+        Args:
+        max_tokens (int): Token budget for the history sent with each request.
+        model (str): Model whose tokenizer is used for counting.
+        pinned (int): Number of leading messages that are never evicted.
+        trim_to (float): Share of the budget the history is trimmed to once it exceeds the
+            budget (1.0 trims only as much as needed, on every turn).
+        """
+        self.max_tokens = max_tokens
+        self.model = model
+        self.pinned = pinned
+        self.trim_to = trim_to
+        self.evicted_messages = 0
+        self.trims = 0
+
+    def history_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        """Return the approximate token count of a message list."""
+        return sum(message_tokens(message, self.model) for message in messages)
+
+    def fit(self, messages: List[Dict[str, Any]], summary: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Trim `messages` to the token budget.
+
+        Args:
+        messages (List[Dict[str, Any]]): The full history, oldest first.
+        summary (str): Rolling summary text standing in for evicted messages, if any.
+
+        Returns:
+        Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: The history to send next turn and
+        the messages that were evicted from it.
+        """
+        # Within the budget the history is left untouched, including the note of the last trim
+        if self.history_tokens(messages) <= self.max_tokens:
+            return messages, []
+
+        pinned = messages[:self.pinned]
+        # A note from a previous trim is rebuilt rather than carried over
+        rest = [message for message in messages[self.pinned:] if not is_history_note(message)]
+        note = make_history_note(summary) if summary else None
+        budget = int(self.max_tokens * self.trim_to) - self.history_tokens(pinned) - (message_tokens(note, self.model) if note else 0)
+
+        groups = group_messages(rest)
+        kept_groups = []
+        used = 0
+        for group in reversed(groups):
+            tokens = self.history_tokens(group)
+            # The newest group is always kept, even if it alone exceeds the budget
+            if kept_groups and used + tokens > budget:
+                break
+            kept_groups.append(group)
+            used += tokens
+        kept_groups.reverse()
+        # A tool result whose call was already evicted cannot be sent on its own
+        while kept_groups and kept_groups[0][0].get("role") == "tool":
+            kept_groups.pop(0)
+
+        kept = [message for group in kept_groups for message in group]
+        evicted = rest[:len(rest) - len(kept)]
+        self.evicted_messages += len(evicted)
+        self.trims += 1
+        return pinned + ([note] if note else []) + kept, evicted
+
+
+def make_history_note(summary: str) -> Dict[str, Any]:
+    """Build the message that stands in for evicted history."""
+    return {"role": "user", "content": f"{HISTORY_NOTE_PREFIX}\n{summary}"}
+
+
+def is_history_note(message: Dict[str, Any]) -> bool:
+    """Return True for a note produced by `make_history_note()`."""
+    return message.get("role") == "user" and (message.get("content") or "").startswith(HISTORY_NOTE_PREFIX)
@@ -0,0 +1,128 @@
+import contextvars
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from swarm import Agent, Swarm
+from swarm.types import Response
+
+# Prompts added to the requests of a round; they steer one request and are not kept in the history
+QUESTION_PROMPT = (
+    "Pose one focused question to the specialists about the most important open issue in the "
+    "political framework. Reply with the question only."
+)
+ANSWER_PROMPT = "The Director asks the specialists: {question}\n\nAnswer from the perspective of your own field in a few sentences."
+SYNTHESIS_PROMPT = (
+    "Synthesize the specialists' answers above, each starting with the name of the specialist who "
+    "gave it, into updated proposals and decisions for the political framework, and evaluate the "
+    "framework if it changed."
+)
+DEFAULT_QUESTION = "Which change to the current proposals and decisions would improve the framework the most?"
+
+
+def attributed(agent: Agent, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return `agent`'s reply messages with its name in front of their content, so the model sees who spoke."""
+    return [
+        dict(message, content=f"{agent.name}: {message['content']}") if message.get("content") else message
+        for message in messages
+    ]
+
+
+def answer_only(agent: Agent) -> Agent:
+    """Return a copy of `agent` without tools, so it can only answer in text."""
+    return agent.model_copy(update={"functions": [], "tool_choice": None})
+
+
+class DeliberationRound:
+    """
+    One fan-out round of deliberation per turn.
+
+    The Director poses a question, every selected specialist answers it concurrently from
+    the same snapshot of the conversation and context, and the answers are appended to the
+    history in roster order (not completion order), each prefixed with the name of the
+    specialist who gave it, before the Director synthesizes them with its usual tools. With
+    enough workers, all specialists are heard in about the wall time of one completion call.
+    """
+
+    def __init__(self, swarm_client: Swarm, director: Agent, specialists: List[Agent], max_workers: Optional[int] = None):
+        """
+        Args:
+        swarm_client (Swarm): The Swarm client that runs every request of the round.
+        director (Agent): The agent that asks the question and synthesizes the answers.
+        specialists (List[Agent]): The agents that answer, in the order their answers are merged.
+        max_workers (int): Specialists answering at once. Defaults to all of them.
+        """
+        self.swarm_client = swarm_client
+        self.director = director
+        self.specialists = [answer_only(agent) for agent in specialists]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(specialists)), thread_name_prefix="specialist")
+
+    def _ask(self, agent: Agent, messages: List[Dict[str, Any]], context_variables: Dict[str, Any], prompt: str,
+             model: Optional[str], debug: bool) -> List[Dict[str, Any]]:
+        response = self.swarm_client.run(
+            agent=agent,
+            messages=messages + [{"role": "user", "content": prompt}],
+            context_variables=context_variables,
+            model_override=model,
+            max_turns=1,
+            debug=debug
+        )
+        return response.messages
+
+    def run(self, messages: List[Dict[str, Any]], context_variables: Dict[str, Any], model: Optional[str] = None,
+            debug: bool = False) -> Response:
+        """
+        Run one round on top of `messages`.
+
+        Args:
+        messages (List[Dict[str, Any]]): The conversation so far.
+        context_variables (Dict[str, Any]): The shared context; only the synthesis may change it.
+        model (str): Model override for every request of the round.
+        debug (bool): Forwarded to Swarm.
+
+        Returns:
+        Response: The question, the answers and the synthesis as new messages, with the
+        agent and context variables the synthesis ended with.
+        """
+        question_messages = self._ask(answer_only(self.director), messages, context_variables, QUESTION_PROMPT, model, debug)
+        question = (question_messages[-1].get("content") or "").strip() if question_messages else ""
+        if not question:
+            question_messages = [{"role": "assistant", "content": DEFAULT_QUESTION, "sender": self.director.name,
+                                  "tool_calls": None, "function_call": None}]
+            question = DEFAULT_QUESTION
+        history = messages + question_messages
+
+        # Every specialist sees the same history and its own copy of the context
+        prompt = ANSWER_PROMPT.format(question=question)
+        futures = [
+            self._executor.submit(contextvars.copy_context().run, self._ask, agent, history,
+                                  copy.deepcopy(context_variables), prompt, model, debug)
+            for agent in self.specialists
+        ]
+        try:
+            answers = [message for agent, future in zip(self.specialists, futures)
+                       for message in attributed(agent, future.result())]
+        except BaseException:
+            # Interrupted or failed: don't start the answers that are still queued
+            for future in futures:
+                future.cancel()
+            raise
+
+        history = history + answers
+        synthesis = self.swarm_client.run(
+            agent=self.director,
+            messages=history + [{"role": "user", "content": SYNTHESIS_PROMPT}],
+            context_variables=context_variables,
+            model_override=model,
+            max_turns=1,
+            debug=debug
+        )
+        return Response(
+            messages=question_messages + answers + synthesis.messages,
+            agent=synthesis.agent,
+            context_variables=synthesis.context_variables
+        )
+
+    def shutdown(self) -> None:
+        """Stop the specialist worker threads."""
+        self._executor.shutdown(wait=True)
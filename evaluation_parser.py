@@ -0,0 +1,228 @@
+import json
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+METRIC_NAMES = ["economy", "fairness", "equality", "technological_progress"]
+
+# Structured output format for the Metrics Evaluator: the API then guarantees a reply
+# matching the schema, for models that support `response_format` JSON schemas
+EVALUATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "framework_evaluation",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "metrics": {
+                    "type": "object",
+                    "properties": {name: {"type": "number"} for name in METRIC_NAMES},
+                    "required": METRIC_NAMES,
+                    "additionalProperties": False,
+                },
+                "political_leaning": {"type": "number"},
+            },
+            "required": ["metrics", "political_leaning"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Structured output format for batched evaluations: one evaluation per listed turn
+BATCH_EVALUATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "framework_evaluation_batch",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "evaluations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "turn": {"type": "integer"},
+                            **EVALUATION_RESPONSE_FORMAT["json_schema"]["schema"]["properties"],
+                        },
+                        "required": ["turn", "metrics", "political_leaning"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["evaluations"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_decoder = json.JSONDecoder()
+
+
+def _extract_json(text: str, opener: str, kind: type) -> Any:
+    if not text:
+        return None
+    candidates = [block.strip() for block in _FENCE.findall(text)] + [text]
+    for candidate in candidates:
+        start = candidate.find(opener)
+        while start != -1:
+            try:
+                value, _ = _decoder.raw_decode(candidate, start)
+            except json.JSONDecodeError:
+                start = candidate.find(opener, start + 1)
+                continue
+            if isinstance(value, kind):
+                return value
+            start = candidate.find(opener, start + 1)
+    return None
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first JSON object found in a model reply.
+
+    Handles bare JSON, JSON inside ``` fences and JSON surrounded by prose: fenced blocks
+    are tried first, then every `{` in the text is tried as the start of an object.
+
+    Args:
+    text (str): The reply text.
+
+    Returns:
+    Optional[Dict[str, Any]]: The decoded object, or None if the text contains none.
+    """
+    return _extract_json(text, "{", dict)
+
+
+def extract_json_array(text: str) -> Optional[List[Any]]:
+    """Return the first JSON array found in a model reply, like `extract_json_object()`."""
+    return _extract_json(text, "[", list)
+
+
+def _number(value: Any, name: str) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"'{name}' is not a number: {value!r}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' is not a number: {value!r}") from None
+    if math.isnan(number) or math.isinf(number):
+        raise ValueError(f"'{name}' is not a finite number: {value!r}")
+    return number
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return min(high, max(low, value))
+
+
+def validate_evaluation(evaluation: Dict[str, Any], current_leaning: float) -> Tuple[Dict[str, float], float]:
+    """
+    Check an evaluation object and bring its values into range.
+
+    Metrics are clamped to [0, 1] and the leaning to [-1, 1]. A missing leaning keeps the
+    current one; a missing or non-numeric metric makes the evaluation invalid.
+
+    Args:
+    evaluation (Dict[str, Any]): The decoded evaluator reply.
+    current_leaning (float): Leaning used when the reply does not contain one.
+
+    Returns:
+    Tuple[Dict[str, float], float]: The metrics and the political leaning.
+
+    Raises:
+    ValueError: If the evaluation is incomplete or not numeric.
+    """
+    metrics = evaluation.get("metrics")
+    if not isinstance(metrics, dict):
+        raise ValueError("The evaluation has no 'metrics' object.")
+    missing = [name for name in METRIC_NAMES if name not in metrics]
+    if missing:
+        raise ValueError(f"The evaluation is missing metrics: {', '.join(missing)}.")
+    clamped = {name: _clamp(_number(metrics[name], name), 0.0, 1.0) for name in METRIC_NAMES}
+    leaning = evaluation.get("political_leaning")
+    leaning = current_leaning if leaning is None else _clamp(_number(leaning, "political_leaning"), -1.0, 1.0)
+    return clamped, leaning
+
+
+def parse_evaluation(text: str, current_leaning: float) -> Tuple[Dict[str, float], float]:
+    """
+    Extract and validate the metrics and leaning from an evaluator reply.
+
+    Args:
+    text (str): The reply text, possibly fenced or surrounded by prose.
+    current_leaning (float): Leaning used when the reply does not contain one.
+
+    Returns:
+    Tuple[Dict[str, float], float]: The metrics and the political leaning.
+
+    Raises:
+    ValueError: If the reply holds no valid evaluation.
+    """
+    evaluation = extract_json_object(text)
+    if evaluation is None:
+        raise ValueError("The reply contains no JSON object.")
+    return validate_evaluation(evaluation, current_leaning)
+
+
+def is_valid_evaluation(text: str) -> bool:
+    """Return True if `text` holds a usable evaluation (used to decide whether a reply may be cached)."""
+    try:
+        parse_evaluation(text, 0.0)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_batch_evaluation(text: str, leanings: Dict[int, float]) -> Dict[int, Tuple[Dict[str, float], float]]:
+    """
+    Extract the per-turn evaluations from the reply to a batched evaluator request.
+
+    The reply is expected as `{"evaluations": [...]}` (a bare array is accepted too). Each
+    item is attributed to the turn named in its `turn` field; items without one are matched
+    by position when the reply has exactly one item per turn. Invalid items are left out, so
+    only their turns count as failed.
+
+    Args:
+    text (str): The reply text, possibly fenced or surrounded by prose.
+    leanings (Dict[int, float]): The current leaning of each evaluated turn, in turn order.
+
+    Returns:
+    Dict[int, Tuple[Dict[str, float], float]]: The metrics and political leaning of each turn
+    that received a valid evaluation.
+
+    Raises:
+    ValueError: If the reply holds no list of evaluations.
+    """
+    wrapper = extract_json_object(text)
+    items = wrapper.get("evaluations") if isinstance(wrapper, dict) else None
+    if not isinstance(items, list):
+        items = extract_json_array(text)
+    if items is None:
+        raise ValueError("The reply contains no list of evaluations.")
+
+    turns = list(leanings)
+    results = {}
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        turn = item.get("turn")
+        if isinstance(turn, bool) or not isinstance(turn, int) or turn not in leanings:
+            if len(items) != len(turns):
+                continue
+            turn = turns[position]
+        try:
+            results[turn] = validate_evaluation(item, leanings[turn])
+        except ValueError:
+            continue
+    return results
+
+
+def batch_evaluation_validator(turns: List[int]) -> Callable[[str], bool]:
+    """Return a check for replies that evaluate every one of `turns` (used to decide whether a batch reply may be cached)."""
+    def is_complete(text: str) -> bool:
+        try:
+            return len(parse_batch_evaluation(text, {turn: 0.0 for turn in turns})) == len(turns)
+        except ValueError:
+            return False
+    return is_complete
@@ -0,0 +1,203 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+# USD per million (prompt, completion, cached prompt) tokens, used for the cost column of the breakdown
+MODEL_PRICES_PER_MILLION = {
+    "gpt-4o-mini": (0.15, 0.60, 0.075),
+    "gpt-4o": (2.50, 10.00, 1.25),
+    "gpt-4.1-mini": (0.40, 1.60, 0.10),
+    "gpt-4.1": (2.00, 8.00, 0.50),
+}
+
+
+@dataclass
+class CallRecord:
+    """Measurements of a single completion call."""
+    call_site: str
+    model: str
+    started_at: float
+    wall_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Prompt tokens served from the provider's prompt-prefix cache (part of prompt_tokens)
+    cached_tokens: int = 0
+    retries: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+
+    def set_usage(self, usage) -> None:
+        """Copy the token counts from an API `usage` object, if present."""
+        if usage is None:
+            return
+        self.prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        self.completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        self.cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0) or 0
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> Optional[float]:
+    """Return the USD cost of the given token counts, or None for a model without a known price. Cached prompt tokens are billed at the discounted rate."""
+    prices = MODEL_PRICES_PER_MILLION.get(model)
+    if prices is None:
+        # Dated snapshots (e.g. gpt-4o-mini-2024-07-18) are priced like their base model
+        matches = [name for name in MODEL_PRICES_PER_MILLION if model.startswith(name)]
+        if not matches:
+            return None
+        prices = MODEL_PRICES_PER_MILLION[max(matches, key=len)]
+    return ((prompt_tokens - cached_tokens) * prices[0] + cached_tokens * prices[2] + completion_tokens * prices[1]) / 1_000_000
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class CallRecorder:
+    """
+    Thread-safe collector of completion call measurements for one run.
+
+    Every call made through `measure()` is kept as a `CallRecord`, so the run can end
+    with a per-call-site breakdown of latency, tokens, retries and cost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records: List[CallRecord] = []
+
+    @contextmanager
+    def measure(self, call_site: str, model: str):
+        """
+        Time the completion call made inside the block.
+
+        The yielded `CallRecord` can be updated with usage, retries or the cache status
+        before the block ends; the wall time and any error are filled in automatically.
+        """
+        record = CallRecord(call_site=call_site, model=model, started_at=time.time())
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.wall_time = time.perf_counter() - started
+            with self._lock:
+                self.records.append(record)
+
+    def breakdown(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate the recorded calls by call site.
+
+        Returns:
+        Dict[str, Dict[str, Any]]: For each call site, the number of calls, cache hits, errors
+        and retries, total/mean/p50/p95 wall time, token totals (including the prompt tokens
+        served from the provider's prefix cache) and estimated cost.
+        """
+        with self._lock:
+            records = list(self.records)
+        sites: Dict[str, List[CallRecord]] = {}
+        for record in records:
+            sites.setdefault(record.call_site, []).append(record)
+
+        breakdown = {}
+        for site, site_records in sites.items():
+            times = sorted(record.wall_time for record in site_records)
+            costs = [estimate_cost(record.model, record.prompt_tokens, record.completion_tokens, record.cached_tokens) for record in site_records]
+            breakdown[site] = {
+                "calls": len(site_records),
+                "cached": sum(record.cached for record in site_records),
+                "errors": sum(record.error is not None for record in site_records),
+                "retries": sum(record.retries for record in site_records),
+                "total_time": sum(times),
+                "mean_time": sum(times) / len(times),
+                "p50_time": _percentile(times, 0.50),
+                "p95_time": _percentile(times, 0.95),
+                "prompt_tokens": sum(record.prompt_tokens for record in site_records),
+                "completion_tokens": sum(record.completion_tokens for record in site_records),
+                "cached_tokens": sum(record.cached_tokens for record in site_records),
+                "cost": None if any(cost is None for cost in costs) else sum(costs),
+            }
+        return dict(sorted(breakdown.items(), key=lambda item: item[1]["total_time"], reverse=True))
+
+    def format_table(self) -> str:
+        """Render the call-site breakdown as a plain-text table, most expensive in time first."""
+        header = f"{'Call site':<36} {'Calls':>6} {'Cached':>6} {'Errors':>6} {'Retries':>7} {'Total s':>9} {'Mean s':>7} {'p95 s':>7} {'Prompt tok':>11} {'Cached tok':>11} {'Compl tok':>10} {'Cost $':>9}"
+        lines = [header, "-" * len(header)]
+        totals = {"calls": 0, "cached": 0, "errors": 0, "retries": 0, "total_time": 0.0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "cost": 0.0}
+        for site, stats in self.breakdown().items():
+            cost = f"{stats['cost']:.4f}" if stats["cost"] is not None else "n/a"
+            lines.append(
+                f"{site[:36]:<36} {stats['calls']:>6} {stats['cached']:>6} {stats['errors']:>6} {stats['retries']:>7} "
+                f"{stats['total_time']:>9.2f} {stats['mean_time']:>7.2f} {stats['p95_time']:>7.2f} "
+                f"{stats['prompt_tokens']:>11} {stats['cached_tokens']:>11} {stats['completion_tokens']:>10} {cost:>9}"
+            )
+            for name in totals:
+                if name == "cost":
+                    totals["cost"] = None if totals["cost"] is None or stats["cost"] is None else totals["cost"] + stats["cost"]
+                else:
+                    totals[name] += stats[name]
+        lines.append("-" * len(header))
+        total_cost = f"{totals['cost']:.4f}" if totals["cost"] is not None else "n/a"
+        lines.append(
+            f"{'Total':<36} {totals['calls']:>6} {totals['cached']:>6} {totals['errors']:>6} {totals['retries']:>7} "
+            f"{totals['total_time']:>9.2f} {'':>7} {'':>7} {totals['prompt_tokens']:>11} {totals['cached_tokens']:>11} {totals['completion_tokens']:>10} {total_cost:>9}"
+        )
+        return "\n".join(lines)
+
+    def export_json(self, path: str) -> None:
+        """Write the breakdown and every individual call record to a JSON file."""
+        with self._lock:
+            records = [asdict(record) for record in self.records]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"breakdown": self.breakdown(), "calls": records}, f, indent=2)
+
+
+class InstrumentedClient:
+    """
+    Wraps an OpenAI client so every `chat.completions.create` call is measured.
+
+    Used as the Swarm client, where requests are built inside Swarm: the call site is
+    derived from the request by `call_site_for(kwargs)` (e.g. from the agent's system
+    prompt) and the record is stored in the recorder returned by `get_recorder()`.
+    With a `scheduler` (see `request_scheduler.RequestScheduler`), requests are rate
+    limited and retried through it and the retries are counted in the record.
+    """
+
+    def __init__(self, client, get_recorder, call_site_for, on_usage=None, scheduler=None):
+        self._client = client
+        self._get_recorder = get_recorder
+        self._call_site_for = call_site_for
+        self._on_usage = on_usage
+        self._scheduler = scheduler
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _send(self, kwargs, record=None):
+        def request():
+            return self._client.chat.completions.create(**kwargs)
+
+        if self._scheduler is None:
+            return request()
+
+        def on_retry(attempt, error, delay):
+            if record is not None:
+                record.retries = attempt
+
+        return self._scheduler.call(request, self._scheduler.estimate_tokens(kwargs), on_retry)
+
+    def _create(self, **kwargs):
+        recorder = self._get_recorder()
+        if recorder is None:
+            completion = self._send(kwargs)
+        else:
+            with recorder.measure(self._call_site_for(kwargs), kwargs.get("model", "")) as record:
+                completion = self._send(kwargs, record)
+                record.set_usage(getattr(completion, "usage", None))
+        if self._on_usage is not None:
+            self._on_usage(getattr(completion, "usage", None))
+        return completion
@@ -0,0 +1,66 @@
+import os
+from typing import Callable, Dict
+
+# Factories that build a client exposing `chat.completions.create(**kwargs)`, the only
+# part of the OpenAI client that the simulation and Swarm use
+_BACKENDS: Dict[str, Callable[[], object]] = {}
+
+
+def register_backend(name: str, factory: Callable[[], object]) -> None:
+    """
+    Make a completion backend selectable through `LLM_BACKEND`.
+
+    Args:
+    name (str): Name used in the `LLM_BACKEND` environment variable.
+    factory (Callable[[], object]): Builds the client from the environment.
+    """
+    _BACKENDS[name] = factory
+
+
+def create_client(name: str):
+    """
+    Build the completion client of the named backend.
+
+    Args:
+    name (str): A registered backend name, e.g. "openai" or "mock".
+
+    Returns:
+    object: A client with an OpenAI-compatible `chat.completions.create`.
+    """
+    try:
+        factory = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM_BACKEND '{name}'. Available backends: {', '.join(sorted(_BACKENDS))}.") from None
+    return factory()
+
+
+def _openai_client():
+    from openai import OpenAI
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    # Ensure OpenAI API key is set
+    if not api_key:
+        raise ValueError("Please set the OPENAI_API_KEY environment variable.")
+    # Retries are handled by the request scheduler, which also counts them
+    return OpenAI(api_key=api_key, max_retries=0)
+
+
+def _mock_client():
+    from mock_llm import MockLLMClient
+
+    options = {
+        "seed": int(os.getenv("MOCK_LLM_SEED", "0")),
+        "latency": float(os.getenv("MOCK_LLM_LATENCY", "0")),
+        "jitter": float(os.getenv("MOCK_LLM_JITTER", "0")),
+        "tool_call_rate": float(os.getenv("MOCK_LLM_TOOL_CALL_RATE", "0.3")),
+        "error_rate": float(os.getenv("MOCK_LLM_ERROR_RATE", "0")),
+        "prompt_cache": os.getenv("MOCK_LLM_PROMPT_CACHE", "true").lower() in ("1", "true", "yes"),
+    }
+    script_path = os.getenv("MOCK_LLM_SCRIPT")
+    if script_path:
+        return MockLLMClient.from_script_file(script_path, **options)
+    return MockLLMClient(**options)
+
+
+register_backend("openai", _openai_client)
+register_backend("mock", _mock_client)
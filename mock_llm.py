@@ -0,0 +1,249 @@
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from context_window import count_tokens
+
+# Whole prompts are counted once each, so they are kept out of count_tokens' memo, which
+# would otherwise hold thousands of them (and dominate the memory of long mock runs)
+_count_tokens = count_tokens.__wrapped__
+
+_POLICY_AREAS = [
+    "progressive taxation", "startup tax incentives", "universal healthcare", "public education funding",
+    "green infrastructure", "research and development grants", "labor protections", "housing supply reform",
+    "universal basic income", "antitrust enforcement", "AI oversight", "trade partnerships",
+]
+_ACTIONS = ["expand", "pilot", "phase in", "reform", "fund", "deregulate", "audit", "protect"]
+# Section headings of a batched evaluator prompt, one per evaluated turn
+_BATCH_TURN = re.compile(r"^### Turn (\d+)$", re.MULTILINE)
+# Simulated prompt-prefix caching, modelled on OpenAI's: prompts are cached in blocks of
+# about 128 tokens (counted here as characters) once the shared prefix reaches about 1024 tokens
+_PREFIX_BLOCK_CHARS = 512
+_PREFIX_MIN_CHARS = 4096
+_PREFIX_CACHE_ENTRIES = 100000
+
+
+class MockRateLimitError(Exception):
+    """Simulated HTTP 429 response, shaped like the OpenAI SDK's `RateLimitError`."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Error code: 429 - simulated rate limit (retry after {retry_after}s)")
+        self.response = SimpleNamespace(headers={"retry-after": str(retry_after)})
+
+
+class MockMessage:
+    """Minimal stand-in for `openai.types.chat.ChatCompletionMessage` as used by Swarm."""
+
+    def __init__(self, content: Optional[str] = None, tool_calls: Optional[List[Dict[str, Any]]] = None):
+        self.role = "assistant"
+        self.content = content
+        self.sender = None
+        self.tool_calls = [
+            SimpleNamespace(
+                id=tool_call["id"],
+                type="function",
+                function=SimpleNamespace(name=tool_call["function"]["name"], arguments=tool_call["function"]["arguments"])
+            )
+            for tool_call in tool_calls
+        ] if tool_calls else None
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {
+            "role": self.role,
+            "content": self.content,
+            "sender": self.sender,
+            "function_call": None,
+            "tool_calls": [
+                {"id": tool_call.id, "type": tool_call.type,
+                 "function": {"name": tool_call.function.name, "arguments": tool_call.function.arguments}}
+                for tool_call in self.tool_calls
+            ] if self.tool_calls else None,
+        }
+
+    def model_dump_json(self) -> str:
+        return json.dumps(self.model_dump())
+
+
+class MockLLMClient:
+    """
+    Offline, deterministic stand-in for the OpenAI client.
+
+    Implements `chat.completions.create` well enough for Swarm, the Metrics Evaluator and
+    the summarizer: agent requests get a policy reply or a tool call (transfers and
+    `evaluate_framework`, with arguments generated from the tool schema), evaluator
+    requests get the metrics JSON (an array of them for batched evaluator requests), and
+    anything else gets a summary. Responses are seeded by the request content, so the same
+    request always gets the same reply regardless of thread scheduling. A script of fixed
+    responses can be played back first. Usage reports the prompt tokens a provider's prefix
+    cache would have served, for prompts that share a long enough prefix (tools first, then
+    messages) with an earlier request.
+    """
+
+    def __init__(self, seed: int = 0, latency: float = 0.0, jitter: float = 0.0, tool_call_rate: float = 0.3,
+                 script: Optional[List[Dict[str, Any]]] = None, error_rate: float = 0.0, retry_after: float = 0.05,
+                 prompt_cache: bool = True):
+        """
+        Args:
+        seed (int): Seed mixed into every response.
+        latency (float): Simulated seconds per call.
+        jitter (float): Maximum extra random seconds added to each call.
+        tool_call_rate (float): Probability that an agent request answers with a tool call.
+        script (List[Dict[str, Any]]): Responses returned, in order, before seeded generation
+            takes over. Each is a message dict with `content` and/or `tool_calls`.
+        error_rate (float): Probability that a call fails with a simulated rate-limit error.
+        retry_after (float): Retry-After seconds reported by the simulated errors.
+        prompt_cache (bool): Report cached prompt tokens for repeated prompt prefixes.
+        """
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.tool_call_rate = tool_call_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.prompt_cache = prompt_cache
+        # Hashes of the prompt prefixes seen so far, least recently used first
+        self._prefixes = OrderedDict()
+        # Failures are drawn from the call sequence, not the request, so a retry can succeed
+        self._errors = random.Random(seed)
+        self._script = list(script or [])
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @classmethod
+    def from_script_file(cls, path: str, **kwargs) -> "MockLLMClient":
+        """Create a client that plays back the JSON list of responses stored at `path`."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(script=json.load(f), **kwargs)
+
+    def _rng(self, request: Dict[str, Any]) -> random.Random:
+        payload = json.dumps([self.seed, request.get("messages"), request.get("model")], sort_keys=True, default=str)
+        return random.Random(int.from_bytes(hashlib.sha256(payload.encode("utf-8")).digest()[:8], "big"))
+
+    def _create(self, **request):
+        rng = self._rng(request)
+        with self._lock:
+            self.calls += 1
+            failed = self.error_rate > 0 and self._errors.random() < self.error_rate
+            scripted = self._script.pop(0) if self._script and not failed else None
+        if failed:
+            raise MockRateLimitError(self.retry_after)
+        delay = self.latency + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        if scripted is not None:
+            message = scripted
+        elif request.get("tools"):
+            message = self._agent_reply(rng, request["tools"])
+        elif _is_evaluation_request(request):
+            turns = _batch_turns(request)
+            if turns:
+                evaluations = [dict(json.loads(self._evaluation(rng)), turn=turn) for turn in turns]
+                message = {"content": json.dumps({"evaluations": evaluations})}
+            else:
+                message = {"content": self._evaluation(rng)}
+        else:
+            message = {"content": self._summary(rng)}
+
+        tool_calls = message.get("tool_calls")
+        if tool_calls:
+            tool_calls = [dict(tool_call, id=tool_call.get("id") or f"call_{next(self._ids)}") for tool_call in tool_calls]
+        prompt_text = json.dumps(request.get("tools") or []) + json.dumps(request.get("messages"), default=str)
+        completion_text = (message.get("content") or "") + json.dumps(tool_calls or [])
+        prompt_tokens = _count_tokens(prompt_text)
+        cached_chars = self._cached_prefix(prompt_text) if self.prompt_cache else 0
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=_count_tokens(completion_text),
+            total_tokens=0,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=prompt_tokens * cached_chars // len(prompt_text)),
+        )
+        usage.total_tokens = usage.prompt_tokens + usage.completion_tokens
+        choice = SimpleNamespace(index=0, finish_reason="tool_calls" if tool_calls else "stop",
+                                 message=MockMessage(message.get("content"), tool_calls))
+        return SimpleNamespace(id=f"mock-{self.calls}", model=request.get("model"), choices=[choice], usage=usage)
+
+    def _cached_prefix(self, prompt_text: str) -> int:
+        """Return how many leading characters of the prompt earlier requests have cached, and cache this prompt's prefixes."""
+        digest = hashlib.sha1()
+        cached = 0
+        with self._lock:
+            for end in range(_PREFIX_BLOCK_CHARS, len(prompt_text) + 1, _PREFIX_BLOCK_CHARS):
+                digest.update(prompt_text[end - _PREFIX_BLOCK_CHARS:end].encode("utf-8"))
+                key = digest.digest()
+                if key in self._prefixes:
+                    self._prefixes.move_to_end(key)
+                    cached = end
+                else:
+                    self._prefixes[key] = None
+            while len(self._prefixes) > _PREFIX_CACHE_ENTRIES:
+                self._prefixes.popitem(last=False)
+        return cached if cached >= _PREFIX_MIN_CHARS else 0
+
+    def _agent_reply(self, rng: random.Random, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if rng.random() < self.tool_call_rate:
+            function = rng.choice(tools)["function"]
+            arguments = {
+                name: _sample_argument(rng, name, schema)
+                for name, schema in function["parameters"].get("properties", {}).items()
+            }
+            return {"content": None, "tool_calls": [{
+                "type": "function",
+                "function": {"name": function["name"], "arguments": json.dumps(arguments)}
+            }]}
+        return {"content": _policy_text(rng, rng.randint(2, 5))}
+
+    def _evaluation(self, rng: random.Random) -> str:
+        return json.dumps({
+            "metrics": {
+                "economy": round(rng.uniform(0.3, 0.9), 2),
+                "fairness": round(rng.uniform(0.3, 0.9), 2),
+                "equality": round(rng.uniform(0.3, 0.9), 2),
+                "technological_progress": round(rng.uniform(0.3, 0.9), 2),
+            },
+            "political_leaning": round(rng.uniform(-1.0, 1.0), 2),
+        })
+
+    def _summary(self, rng: random.Random) -> str:
+        return "The agents discussed: " + _policy_text(rng, rng.randint(2, 4))
+
+
+def _is_evaluation_request(request: Dict[str, Any]) -> bool:
+    if request.get("response_format"):
+        return True
+    return any("political_leaning" in (message.get("content") or "") for message in request.get("messages", []))
+
+
+def _batch_turns(request: Dict[str, Any]) -> List[int]:
+    return [int(turn) for message in request.get("messages", []) for turn in _BATCH_TURN.findall(message.get("content") or "")]
+
+
+def _policy_text(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        f"We should {rng.choice(_ACTIONS)} {rng.choice(_POLICY_AREAS)} to balance {rng.choice(_POLICY_AREAS)}."
+        for _ in range(sentences)
+    )
+
+
+def _sample_argument(rng: random.Random, name: str, schema: Dict[str, Any]) -> Any:
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type", "string")
+    if kind == "number":
+        return round(rng.uniform(-1.0, 1.0), 2)
+    if kind == "integer":
+        return rng.randint(0, 10)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return _policy_text(rng, 1)
@@ -1,67 +1,309 @@
 import os
-import traceback
+import copy
+import argparse
 import json
+import hashlib
 import statistics
-import matplotlib.pyplot as plt
-from typing import Dict, Any
-from swarm import Swarm, Agent
-from openai import OpenAI
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from response_cache import ResponseCache
+from turn_pipeline import TurnPipeline
+from run_journal import RunJournal, load_journal
+from checkpoint import load_checkpoint, save_checkpoint, truncate_file
+from context_window import ContextWindow
+from summary_hierarchy import SummaryHierarchy
+from instrumentation import CallRecorder, InstrumentedClient
+from llm_backends import create_client
+from request_scheduler import CircuitBreaker, RequestScheduler
+from evaluation_parser import (BATCH_EVALUATION_RESPONSE_FORMAT, EVALUATION_RESPONSE_FORMAT, batch_evaluation_validator,
+                               is_valid_evaluation, parse_batch_evaluation, parse_evaluation)
+from batch_evaluation import EvaluationBatch, append_batch_request
+from similarity_index import MinHashIndex
+from run_logging import SUBSYSTEMS, enable_debug, get_logger, is_logging_configured, run_log, setup_logging
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Load environment variables, setting default values if env vars are not set
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Completion backend: "openai" for the real API, "mock" for the offline stand-in in mock_llm.py
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
 OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
 OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "1024"))
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 MAX_TURNS = int(os.getenv("MAX_TURNS", "300"))
+# Re-evaluate unchanged proposals/decisions every N turns anyway (0 = only when they change)
+EVALUATION_INTERVAL = int(os.getenv("EVALUATION_INTERVAL", "0"))
+# Run evaluations and summaries on background workers instead of blocking each turn
+PIPELINED_EVALUATION = os.getenv("PIPELINED_EVALUATION", "false").lower() in ("1", "true", "yes")
+EVALUATION_WORKERS = int(os.getenv("EVALUATION_WORKERS", "2"))
+# Number of turns written to the run journal between flushes
+JOURNAL_FLUSH_EVERY = int(os.getenv("JOURNAL_FLUSH_EVERY", "10"))
+# Save a resumable checkpoint every N turns
+CHECKPOINT_EVERY = int(os.getenv("CHECKPOINT_EVERY", "10"))
+# Token budget for the conversation history sent with each agent request
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "16000"))
+# Share of the budget the history is trimmed to once it is exceeded; the slack keeps the
+# history prefix unchanged for several turns (1.0 trims on every turn once the budget is full)
+CONTEXT_TRIM_TARGET = float(os.getenv("CONTEXT_TRIM_TARGET", "0.75"))
+# How agents hand off: "mesh" gives every agent one transfer function per other agent,
+# "routed" gives it a single transfer_to_agent(agent_name) tool
+HANDOFF_MODE = os.getenv("HANDOFF_MODE", "mesh")
+# Optional JSON file mapping agent names to the agents they may hand off to (routed mode)
+HANDOFF_ROUTES_PATH = os.getenv("HANDOFF_ROUTES_PATH")
+# How a turn is run: "handoff" runs the Director, which may hand off to one specialist;
+# "round" has the Director ask a question that the specialists answer concurrently
+DELIBERATION_MODE = os.getenv("DELIBERATION_MODE", "handoff")
+# Comma-separated specialists that answer in round mode (default: all but the Director and the Metrics Evaluator)
+ROUND_SPECIALISTS = os.getenv("ROUND_SPECIALISTS", "")
+# Specialists answering at once in round mode (0 = all of them)
+ROUND_WORKERS = int(os.getenv("ROUND_WORKERS", "0"))
+# Completion token limit of the Metrics Evaluator; its JSON reply needs well under 100 tokens
+EVALUATOR_MAX_TOKENS = int(os.getenv("EVALUATOR_MAX_TOKENS", "150"))
+# Ask the evaluator for a JSON-schema structured reply (falls back automatically for models without support)
+EVALUATOR_STRUCTURED_OUTPUT = os.getenv("EVALUATOR_STRUCTURED_OUTPUT", "true").lower() in ("1", "true", "yes")
+# Score this many turns' snapshots with a single evaluator request (1 = evaluate every turn on its own)
+EVALUATION_BATCH_SIZE = int(os.getenv("EVALUATION_BATCH_SIZE", "1"))
+# Also write every batched evaluator request to a JSONL file for a provider batch endpoint
+EVALUATION_BATCH_EXPORT = os.getenv("EVALUATION_BATCH_EXPORT", "false").lower() in ("1", "true", "yes")
+# Request quota shared by all runs of the process (0 = unlimited; the mock backend is unlimited by default)
+API_RPM_LIMIT = float(os.getenv("API_RPM_LIMIT", "500" if LLM_BACKEND == "openai" else "0"))
+API_TPM_LIMIT = float(os.getenv("API_TPM_LIMIT", "200000" if LLM_BACKEND == "openai" else "0"))
+# Retries of rate-limited or failed requests, with jittered exponential backoff
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "6"))
+API_BACKOFF_BASE = float(os.getenv("API_BACKOFF_BASE", "1.0"))
+API_BACKOFF_MAX = float(os.getenv("API_BACKOFF_MAX", "60"))
+# Consecutive failures that pause all requests, and the initial pause in seconds
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))
+CIRCUIT_BREAKER_RESET = float(os.getenv("CIRCUIT_BREAKER_RESET", "30"))
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", ".response_cache.sqlite3")
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Reuse the scores of near-identical earlier frameworks instead of calling the evaluator,
+# and mark agent replies that repeat earlier ones (MinHash similarity of word shingles).
+# Off by default: reused scores change the metric and leaning series of a run
+SEMANTIC_DEDUP = os.getenv("SEMANTIC_DEDUP", "false").lower() in ("1", "true", "yes")
+SEMANTIC_DEDUP_THRESHOLD = float(os.getenv("SEMANTIC_DEDUP_THRESHOLD", "0.9"))
+# Frameworks and replies remembered per run for the comparison
+SEMANTIC_INDEX_SIZE = int(os.getenv("SEMANTIC_INDEX_SIZE", "1000"))
+# Tell the Director when the previous turn repeated an earlier one
+SEMANTIC_DEDUP_HINTS = os.getenv("SEMANTIC_DEDUP_HINTS", "false").lower() in ("1", "true", "yes")
+# Log level of the simulation, and per-subsystem overrides (empty = inherit LOG_LEVEL);
+# Swarm's request/response dumps are at DEBUG level and stay off unless enabled for a run
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVEL_SWARM = os.getenv("LOG_LEVEL_SWARM", "")
+LOG_LEVEL_EVALUATOR = os.getenv("LOG_LEVEL_EVALUATOR", "")
+LOG_LEVEL_SUMMARIZER = os.getenv("LOG_LEVEL_SUMMARIZER", "")
+# Lowest level shown on the console; every enabled record also goes to the run's run.log
+LOG_CONSOLE_LEVEL = os.getenv("LOG_CONSOLE_LEVEL", "INFO")
+# Size at which run.log is rotated, and the rotated files kept
+LOG_FILE_MAX_BYTES = int(os.getenv("LOG_FILE_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_FILE_BACKUPS = int(os.getenv("LOG_FILE_BACKUPS", "3"))
+
+log = get_logger("run")
+swarm_log = get_logger("swarm")
+evaluator_log = get_logger("evaluator")
+summarizer_log = get_logger("summarizer")
+request_log = get_logger("requests")
+
+# The completion client, the agents and the response cache are created on first use (see
+# `get_client()`, `get_agents()` and `get_response_cache()`), and matplotlib, openai and
+# swarm are only imported where they are needed, so importing this module stays cheap.
+_client = None
+_agents = None
+_response_cache = None
+_request_scheduler = None
+_lazy_init_lock = threading.RLock()
+
+def get_client():
+    """Return the completion client of `LLM_BACKEND`, creating it on first use (the OpenAI backend requires OPENAI_API_KEY)."""
+    global _client
+    if _client is None:
+        with _lazy_init_lock:
+            if _client is None:
+                _client = create_client(LLM_BACKEND)
+    return _client
+
+@dataclass
+class RunConfig:
+    """
+    Settings for a single simulation run.
 
-# Ensure OpenAI API key is set
-if not OPENAI_API_KEY:
-    raise ValueError("Please set the OPENAI_API_KEY environment variable.")
-
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+    Defaults come from the environment, so `main()` without arguments behaves like a plain
+    `python optimal_politics_swarm.py` run. The batch runner creates one per grid point.
+    """
+    temperature: float = OPENAI_TEMPERATURE
+    max_turns: int = MAX_TURNS
+    model: str = OPENAI_MODEL
+    seed: Optional[int] = None
+    output_dir: str = "."
+    pipelined: bool = PIPELINED_EVALUATION
+
+    def output_path(self, filename: str) -> str:
+        """Return the path of an output file inside this run's output directory."""
+        if self.output_dir in ("", "."):
+            return filename
+        return os.path.join(self.output_dir, filename)
+
+    @property
+    def call_stats_path(self) -> str:
+        """Path of the machine-readable per-call latency/token/cost export of this run."""
+        return self.output_path(f"call_stats_{self.max_turns}_{self.temperature}.json")
+
+    @property
+    def journal_path(self) -> str:
+        """Path of the per-turn JSONL journal of this run."""
+        return self.output_path(f"journal_{self.max_turns}_{self.temperature}.jsonl")
+
+    @property
+    def checkpoint_path(self) -> str:
+        """Path of the latest resumable checkpoint of this run."""
+        return self.output_path(f"checkpoint_{self.max_turns}_{self.temperature}.json")
+
+    @property
+    def evaluation_batch_path(self) -> str:
+        """Path of the provider batch input file the batched evaluator requests are exported to."""
+        return self.output_path(f"evaluation_batches_{self.max_turns}_{self.temperature}.jsonl")
+
+# The run configuration and context dictionary of the run executing in the current
+# thread/task. ContextVars keep concurrent runs started by the batch runner isolated.
+_active_run_config = ContextVar("active_run_config", default=None)
+_active_context_variables = ContextVar("active_context_variables", default=None)
+_active_token_usage = ContextVar("active_token_usage", default=None)
+_active_call_recorder = ContextVar("active_call_recorder", default=None)
+_active_evaluation_index = ContextVar("active_evaluation_index", default=None)
+
+def get_run_config() -> RunConfig:
+    """Return the configuration of the active run, or the environment defaults outside a run."""
+    config = _active_run_config.get()
+    return config if config is not None else RunConfig()
+
+class TokenUsage:
+    """Thread-safe running total of the tokens reported by completion responses."""
+
+    def __init__(self, prompt_tokens=0, completion_tokens=0):
+        self._lock = threading.Lock()
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    def add(self, usage):
+        if usage is None:
+            return
+        with self._lock:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"prompt_tokens": self.prompt_tokens, "completion_tokens": self.completion_tokens}
+
+def record_usage(usage):
+    """Add the usage of a completion to the active run's token counter, if any."""
+    tracker = _active_token_usage.get()
+    if tracker is not None:
+        tracker.add(usage)
+
+def get_request_scheduler() -> RequestScheduler:
+    """Return the process-wide scheduler that rate limits and retries every completion request."""
+    global _request_scheduler
+    if _request_scheduler is None:
+        with _lazy_init_lock:
+            if _request_scheduler is None:
+                _request_scheduler = RequestScheduler(
+                    requests_per_minute=API_RPM_LIMIT,
+                    tokens_per_minute=API_TPM_LIMIT,
+                    max_retries=API_MAX_RETRIES,
+                    backoff_base=API_BACKOFF_BASE,
+                    backoff_max=API_BACKOFF_MAX,
+                    breaker=CircuitBreaker(CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_RESET),
+                    default_max_tokens=OPENAI_MAX_TOKENS
+                )
+    return _request_scheduler
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the shared on-disk cache for the evaluator and summarizer completions, or None if disabled."""
+    global _response_cache
+    if _response_cache is None and RESPONSE_CACHE_ENABLED:
+        with _lazy_init_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(RESPONSE_CACHE_PATH, max_bytes=RESPONSE_CACHE_MAX_BYTES)
+    return _response_cache
+
+def completion_request(messages, max_tokens=None, response_format=None) -> Dict[str, Any]:
+    """Build the chat completion request for `messages` with the active run's model, temperature and seed."""
+    config = get_run_config()
+    return {
+        "model": config.model,
+        "messages": messages,
+        "temperature": config.temperature,
+        "max_tokens": OPENAI_MAX_TOKENS if max_tokens is None else max_tokens,
+        "n": 1,
+        "stop": None,
+        **({"seed": config.seed} if config.seed is not None else {}),
+        **({"response_format": response_format} if response_format is not None else {})
+    }
 
-# Define the Metrics Evaluator agent's function using Chat Completion API
-def evaluate_metrics(proposals: str, decisions: str, current_leaning: float, context_variables: Dict[str, Any] = None) -> str:
+def request_completion(messages, max_tokens=None, use_cache=True, call_site="direct", response_format=None, cache_if=None) -> str:
     """
-    Evaluate the current state of the political framework using a sophisticated analysis.
+    Send a chat completion request and return the stripped reply text, using the response cache.
 
-    This function leverages the OpenAI Chat Completion API to analyze the proposals and decisions,
-    determining the metrics and political leaning based on the content.
+    The model, temperature and seed come from the active `RunConfig`. Identical requests
+    (same model, temperature, seed, max_tokens and messages) are served from the
+    response cache without contacting the API. Caching can be turned off for a single call
+    with `use_cache=False` or for a block of calls with `ResponseCache.bypass()`. Requests
+    that do reach the API go through the shared request scheduler, which rate limits them
+    and retries rate-limit and transient errors.
 
     Args:
-    proposals (str): A string containing the current proposals.
-    decisions (str): A string containing the current decisions.
-    current_leaning (float): The current political leaning.
-    context_variables (Dict[str, Any]): The current context variables dictionary.
+    messages (list): The chat messages to send.
+    max_tokens (int): The completion token limit. Defaults to OPENAI_MAX_TOKENS.
+    use_cache (bool): Whether this call may read from and write to the cache.
+    call_site (str): Name under which the call is reported in the run's call statistics.
+    response_format (dict): Optional structured output format sent with the request.
+    cache_if (Callable[[str], bool]): Only replies for which this returns True are cached.
 
     Returns:
-    str: A string describing the evaluation results.
+    str: The content of the first choice.
     """
-    try:
-        # Early return if both proposals and decisions are empty
-        if not proposals.strip() and not decisions.strip():
-            print("No proposals or decisions provided. Skipping framework evaluation.")
-            return "No proposals or decisions provided. Skipping framework evaluation."
-
-        print(f"\n--- Starting framework evaluation (Metrics Evaluator) ---")
-        print(f"Input proposals: {proposals}")
-        print(f"Input decisions: {decisions}")
-        print(f"Current political leaning: {current_leaning}")
-        print(f"Context type: {type(context_variables)}")
-
-        # Use the existing context_variables if not provided
-        if context_variables is None or not context_variables:
-            print("Context variables not provided or empty. Using global context.")
-            context_variables = current_context_variables  # Assuming global variable
-
-        # Prepare the prompt for OpenAI Chat Completion
-        prompt = f"""
-You are an AI assistant tasked with evaluating a set of political proposals and decisions. Based on the provided information, determine the following metrics:
+    config = get_run_config()
+    if max_tokens is None:
+        max_tokens = OPENAI_MAX_TOKENS
+    cache = get_response_cache() if use_cache and not ResponseCache.is_bypassed() else None
+    recorder = _active_call_recorder.get() or CallRecorder()
+
+    with recorder.measure(call_site, config.model) as record:
+        key = None
+        if cache is not None:
+            key = ResponseCache.make_key(config.model, config.temperature, max_tokens, messages, seed=config.seed, response_format=response_format)
+            cached = cache.get(key)
+            if cached is not None:
+                request_log.debug("Response for %s served from cache.", call_site)
+                record.cached = True
+                return cached
+
+        request = completion_request(messages, max_tokens, response_format)
+
+        def on_retry(attempt, error, delay):
+            record.retries = attempt
+            request_log.warning("Request for %s failed (%s). Retry %d in %.1fs.", call_site, error, attempt, delay)
+
+        scheduler = get_request_scheduler()
+        completion = scheduler.call(lambda: get_client().chat.completions.create(**request), scheduler.estimate_tokens(request), on_retry)
+        record.set_usage(getattr(completion, "usage", None))
+    record_usage(getattr(completion, "usage", None))
+    response_text = (completion.choices[0].message.content or "").strip()
+
+    if cache is not None and (cache_if is None or cache_if(response_text)):
+        cache.put(key, response_text)
+    return response_text
+
+# Evaluator prompts. Everything static (criteria, instructions, reply format) goes in the
+# system message so every evaluator request starts with the same bytes and the provider's
+# prompt-prefix cache can serve it; the framework state comes last, in the user message.
+EVALUATION_CRITERIA = """You are an AI assistant that evaluates political proposals and decisions. Based on the provided information, determine the following metrics:
 
 1. **Economy**: Rate the potential impact on economic growth and sustainability.
 2. **Fairness**: Assess how the proposals and decisions promote fairness and protect consumer rights.
@@ -69,80 +311,205 @@ You are an AI assistant tasked with evaluating a set of political proposals and
 4. **Technological Progress**: Analyze how the policies encourage technological innovation and oversight.
 
 Additionally, determine the overall political leaning of the proposals and decisions on a scale from -1 to 1, where -1 is extremely left-leaning, 0 is centrist, and 1 is extremely right-leaning.
+"""
 
-**Proposals:**
-{proposals}
-
-**Decisions:**
-{decisions}
-
-**Current Political Leaning:** {current_leaning}
-
+EVALUATOR_SYSTEM_PROMPT = EVALUATION_CRITERIA + """
 **Instructions:**
+- Evaluate the proposals, decisions and current political leaning given in the user message.
 - Provide a score for each metric (economy, fairness, equality, technological_progress) on a scale from 0 to 1, where 0 is the lowest impact and 1 is the highest.
 - Provide the overall political leaning score.
 - **Ensure that your response strictly follows the JSON format specified below. Do not include any additional text or explanations.**
 - Format your response as a JSON object with the following structure:
 
-{{
-    "metrics": {{
+{
+    "metrics": {
         "economy": float,
         "fairness": float,
         "equality": float,
         "technological_progress": float
-    }},
+    },
     "political_leaning": float
-}}
+}
 """
 
-        # Call the OpenAI Chat Completion API using the client object
-        completion = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an AI assistant that evaluates political proposals and decisions."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=OPENAI_TEMPERATURE,
-            max_tokens=OPENAI_MAX_TOKENS,
-            n=1,
-            stop=None
-        )
+BATCH_EVALUATOR_SYSTEM_PROMPT = EVALUATION_CRITERIA + """
+**Instructions:**
+- The user message lists the framework of several turns of a discussion. Evaluate every listed turn separately, based on that turn's proposals and decisions only, and include its turn number.
+- Provide a score for each metric (economy, fairness, equality, technological_progress) on a scale from 0 to 1, where 0 is the lowest impact and 1 is the highest.
+- Provide the overall political leaning score.
+- **Ensure that your response strictly follows the JSON format specified below. Do not include any additional text or explanations.**
+- Format your response as a JSON object with the following structure:
+
+{
+    "evaluations": [
+        {
+            "turn": int,
+            "metrics": {
+                "economy": float,
+                "fairness": float,
+                "equality": float,
+                "technological_progress": float
+            },
+            "political_leaning": float
+        }
+    ]
+}
+"""
+
+def format_framework_state(proposals, decisions, current_leaning) -> str:
+    """Format the framework state that the evaluator scores, as the variable part of its prompt."""
+    return f"""**Proposals:**
+{proposals}
+
+**Decisions:**
+{decisions}
+
+**Current Political Leaning:** {current_leaning}
+"""
+
+# Models that rejected the structured output format; the evaluator asks them for plain JSON instead
+_structured_output_unsupported = set()
 
-        # Parse the response
-        response_text = completion.choices[0].message.content.strip()
-        print(f"OpenAI response: {response_text}")
+def evaluation_response_format(response_format=EVALUATION_RESPONSE_FORMAT):
+    """Return the structured output format to request from the evaluator, or None if the model cannot use it."""
+    if EVALUATOR_STRUCTURED_OUTPUT and get_run_config().model not in _structured_output_unsupported:
+        return response_format
+    return None
 
-        # Attempt to parse JSON
+def request_evaluation(messages, max_tokens=EVALUATOR_MAX_TOKENS, response_format=EVALUATION_RESPONSE_FORMAT,
+                       cache_if=is_valid_evaluation, call_site="evaluator") -> str:
+    """
+    Send an evaluator request, preferring a JSON-schema structured reply.
+
+    The completion is capped at EVALUATOR_MAX_TOKENS and only replies that hold a valid
+    evaluation are cached. A model that rejects `response_format` is remembered and asked
+    without it from then on.
+
+    Args:
+    messages (list): The evaluator chat messages.
+    max_tokens (int): The completion token limit.
+    response_format (dict): The structured output format, used if the model supports it.
+    cache_if (Callable[[str], bool]): Only replies for which this returns True are cached.
+    call_site (str): Name under which the call is reported in the run's call statistics.
+
+    Returns:
+    str: The reply text.
+    """
+    model = get_run_config().model
+    structured_format = evaluation_response_format(response_format)
+    if structured_format is not None:
         try:
-            evaluation = json.loads(response_text)
-            metrics = evaluation.get("metrics", {})
-            new_leaning = evaluation.get("political_leaning", current_leaning)
-        except json.JSONDecodeError:
-            print("Failed to parse OpenAI response as JSON.")
+            return request_completion(messages, max_tokens=max_tokens, call_site=call_site,
+                                      response_format=structured_format, cache_if=cache_if)
+        except Exception as e:
+            # 400 Bad Request: the model does not support JSON schema response formats
+            if getattr(e, "status_code", None) != 400 or "response_format" not in str(e):
+                raise
+            evaluator_log.warning("Model %s does not support structured output; requesting plain JSON.", model)
+            _structured_output_unsupported.add(model)
+    return request_completion(messages, max_tokens=max_tokens, call_site=call_site, cache_if=cache_if)
+
+# Define the Metrics Evaluator agent's function using Chat Completion API
+def evaluate_metrics(proposals: str, decisions: str, current_leaning: float, context_variables: Dict[str, Any] = None) -> str:
+    """
+    Evaluate the current state of the political framework using a sophisticated analysis.
+
+    This function leverages the OpenAI Chat Completion API to analyze the proposals and decisions,
+    determining the metrics and political leaning based on the content.
+
+    Args:
+    proposals (str): A string containing the current proposals.
+    decisions (str): A string containing the current decisions.
+    current_leaning (float): The current political leaning.
+    context_variables (Dict[str, Any]): The current context variables dictionary.
+
+    Returns:
+    str: A string describing the evaluation results.
+    """
+    try:
+        # Early return if both proposals and decisions are empty
+        if not proposals.strip() and not decisions.strip():
+            evaluator_log.info("No proposals or decisions provided. Skipping framework evaluation.")
+            return "No proposals or decisions provided. Skipping framework evaluation."
+
+        evaluator_log.debug("Starting framework evaluation (Metrics Evaluator)")
+        evaluator_log.debug("Input proposals: %s", proposals)
+        evaluator_log.debug("Input decisions: %s", decisions)
+        evaluator_log.debug("Current political leaning: %s", current_leaning)
+
+        # Use the existing context_variables if not provided
+        if context_variables is None or not context_variables:
+            evaluator_log.debug("Context variables not provided or empty. Using the active run's context.")
+            context_variables = _active_context_variables.get()
+
+        # The static instructions form a byte-identical prefix; only the framework state varies
+        response_text = request_evaluation([
+            {"role": "system", "content": EVALUATOR_SYSTEM_PROMPT},
+            {"role": "user", "content": format_framework_state(proposals, decisions, current_leaning)}
+        ])
+        evaluator_log.debug("OpenAI response: %s", response_text)
+
+        # Extract the JSON object, even from fenced or noisy replies, and clamp its values
+        try:
+            metrics, new_leaning = parse_evaluation(response_text, current_leaning)
+        except ValueError as e:
+            evaluator_log.warning("Failed to parse OpenAI response as an evaluation: %s", e)
             return "Error: Failed to parse evaluation results."
 
-        print(f"Metrics: {metrics}")
-        print(f"New political leaning: {new_leaning}")
+        evaluator_log.info("Framework evaluated. Metrics: %s, political leaning: %s", metrics, new_leaning)
 
         # Update the context_variables
         context_variables["metrics"] = metrics
         context_variables["political_leaning"] = new_leaning
-        print("Context updated successfully")
-        print(f"--- Framework evaluation (Metrics Evaluator) completed ---\n")
 
         return f"Framework evaluated. New metrics: {metrics}, New leaning: {new_leaning}"
 
     except Exception as e:
-        print(f"An error occurred during framework evaluation: {str(e)}")
-        print("Traceback:")
-        traceback.print_exc()
+        evaluator_log.exception("An error occurred during framework evaluation: %s", e)
         return "Error occurred during framework evaluation. Please check the logs for details."
 
+def framework_text(proposals: str, decisions: str) -> str:
+    """Return the text a framework state is compared by in the run's evaluation index."""
+    return f"{proposals}\n{decisions}"
+
+def reuse_similar_evaluation(proposals: str, decisions: str, context_variables: Dict[str, Any]) -> Optional[str]:
+    """
+    Reuse the scores of a near-identical framework evaluated earlier in the run, if there is one.
+
+    Args:
+    proposals (str): The current proposals.
+    decisions (str): The current decisions.
+    context_variables (Dict[str, Any]): Receives the reused metrics and leaning.
+
+    Returns:
+    Optional[str]: The evaluation result string, or None if the framework has to be evaluated.
+    """
+    index = _active_evaluation_index.get()
+    if index is None:
+        return None
+    match = index.query(framework_text(proposals, decisions))
+    if match is None:
+        return None
+    metrics, new_leaning = dict(match.payload["metrics"]), match.payload["political_leaning"]
+    evaluator_log.info("Framework is a near-duplicate (similarity %.2f) of an evaluated one. Reusing its metrics.", match.similarity)
+    context_variables["metrics"] = metrics
+    context_variables["political_leaning"] = new_leaning
+    return f"Framework evaluated (scores reused from a near-identical framework). New metrics: {metrics}, New leaning: {new_leaning}"
+
+def remember_evaluation(proposals: str, decisions: str, metrics: Dict[str, float], leaning: float) -> None:
+    """Add an evaluated framework and its scores to the run's evaluation index."""
+    index = _active_evaluation_index.get()
+    if index is not None:
+        text = framework_text(proposals, decisions)
+        index.add(hashlib.sha256(text.encode("utf-8")).hexdigest(), text,
+                  {"metrics": dict(metrics), "political_leaning": leaning})
+
 def evaluate_framework(proposals: str, decisions: str, current_leaning: float, context_variables: Dict[str, Any] = None) -> str:
     """
     Evaluate the current state of the political framework and update the context_variables.
 
-    This function delegates the evaluation to the Metrics Evaluator agent.
+    This function delegates the evaluation to the Metrics Evaluator agent, unless a
+    near-identical framework was already evaluated in this run (see `SEMANTIC_DEDUP`).
 
     Args:
     proposals (str): A string containing the current proposals.
@@ -153,14 +520,239 @@ def evaluate_framework(proposals: str, decisions: str, current_leaning: float, c
     Returns:
     str: A string describing the evaluation results.
     """
-    return evaluate_metrics(proposals, decisions, current_leaning, context_variables)
+    if not context_variables:
+        context_variables = _active_context_variables.get()
+    reused = reuse_similar_evaluation(proposals, decisions, context_variables)
+    if reused is not None:
+        return reused
+    evaluation_result = evaluate_metrics(proposals, decisions, current_leaning, context_variables)
+    if evaluation_result.startswith("Framework evaluated"):
+        remember_evaluation(proposals, decisions, context_variables["metrics"], context_variables["political_leaning"])
+    return evaluation_result
+
+class IncrementalEvaluator:
+    """
+    Decide whether the framework needs a fresh evaluation on the current turn.
+
+    Keeps a fingerprint of the (proposals, decisions, leaning) state left behind by the
+    last evaluation. While that state is unchanged the previous metrics are still valid,
+    so the evaluator call is skipped unless `interval` turns have passed since the last
+    evaluation (an interval of 0 means "only on change").
+    """
+
+    def __init__(self, interval=0):
+        self.interval = interval
+        self.last_fingerprint = None
+        self.last_turn = None
+        self.last_inputs = None
+        self.evaluations = 0
+        self.reuses = 0
+
+    @staticmethod
+    def fingerprint(proposals, decisions, leaning) -> str:
+        payload = json.dumps([proposals, decisions, leaning], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_due(self, turn, proposals, decisions, leaning) -> bool:
+        """Return True if the state differs from the last evaluated one or the interval has elapsed."""
+        if self.last_fingerprint != self.fingerprint(proposals, decisions, leaning):
+            return True
+        return self.interval > 0 and turn - self.last_turn >= self.interval
+
+    def record(self, turn, proposals, decisions, leaning):
+        """Remember the state produced by an evaluation completed on `turn`."""
+        self.evaluations += 1
+        if self.last_turn is not None and turn < self.last_turn:
+            # A newer evaluation is still pending: keep its inputs, but with the leaning now in context
+            proposals, decisions = self.last_inputs
+        else:
+            self.last_turn = turn
+            self.last_inputs = (proposals, decisions)
+        self.last_fingerprint = self.fingerprint(proposals, decisions, leaning)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Return the tracker state for a checkpoint."""
+        return {
+            "last_fingerprint": self.last_fingerprint,
+            "last_turn": self.last_turn,
+            "last_inputs": self.last_inputs,
+            "evaluations": self.evaluations,
+            "reuses": self.reuses
+        }
+
+    def load_state(self, state):
+        """Restore the tracker state saved by `state_dict()`."""
+        self.last_fingerprint = state["last_fingerprint"]
+        self.last_turn = state["last_turn"]
+        self.last_inputs = tuple(state["last_inputs"]) if state["last_inputs"] is not None else None
+        self.evaluations = state["evaluations"]
+        self.reuses = state["reuses"]
+
+    def mark_pending(self, turn, proposals, decisions, leaning):
+        """Treat the input state of an evaluation submitted on `turn` as evaluated until it completes."""
+        self.last_fingerprint = self.fingerprint(proposals, decisions, leaning)
+        self.last_turn = turn
+        self.last_inputs = (proposals, decisions)
+
+    def fail(self, turn):
+        """Forget the evaluation submitted on `turn`, which failed, so the next turn retries it."""
+        if self.last_turn == turn:
+            self.last_fingerprint = None
+
+def evaluate_snapshot(proposals, decisions, leaning, metrics):
+    """
+    Evaluate a frozen copy of the framework state, for use on a background worker.
+
+    The evaluator writes its results into a private snapshot instead of the live context,
+    so the turn loop can keep running and merge them later.
+
+    Returns:
+    tuple: The evaluation result string and the snapshot holding the new metrics and leaning.
+    """
+    snapshot = {
+        "current_proposals": proposals,
+        "decisions": decisions,
+        "metrics": dict(metrics),
+        "political_leaning": leaning
+    }
+    evaluation_result = evaluate_framework(proposals, decisions, leaning, context_variables=snapshot)
+    return evaluation_result, snapshot
+
+def build_batch_evaluation_prompt(snapshots) -> str:
+    """
+    Build the user message listing the snapshots a batched evaluator request scores.
+
+    Proposals or decisions identical to the previous listed turn are referenced instead of
+    repeated, so consecutive snapshots of a slowly changing framework stay cheap to send.
+    The instructions are in `BATCH_EVALUATOR_SYSTEM_PROMPT`.
+
+    Args:
+    snapshots (list): (turn, snapshot) pairs in turn order.
+
+    Returns:
+    str: The prompt text.
+    """
+    sections = []
+    previous = None
+    for turn, snapshot in snapshots:
+        proposals, decisions = snapshot["current_proposals"], snapshot["decisions"]
+        if previous is not None and proposals == previous[1]["current_proposals"]:
+            proposals = f"(unchanged from turn {previous[0]})"
+        if previous is not None and decisions == previous[1]["decisions"]:
+            decisions = f"(unchanged from turn {previous[0]})"
+        sections.append(f"### Turn {turn}\n\n" + format_framework_state(proposals, decisions, snapshot["political_leaning"]))
+        previous = (turn, snapshot)
+    return "\n".join(sections)
+
+def evaluate_snapshots(entries, export_path=None):
+    """
+    Score a batch of buffered framework snapshots with a single evaluator request.
+
+    Each turn's score is returned separately so it can be attributed to that turn in the
+    run's history. Turns the reply leaves out (or evaluates invalidly) fail on their own.
+
+    Args:
+    entries (list): (turn, snapshot) pairs in turn order, as collected by `EvaluationBatch`;
+        the snapshot is None for turns that reused the previous evaluation.
+    export_path (str): Also append the request to this provider batch input file.
+
+    Returns:
+    list: (turn, outcome) pairs in turn order, where the outcome is None for turns without a
+    snapshot and otherwise the evaluation result string and the snapshot holding the new
+    metrics and leaning, as returned by `evaluate_snapshot()`.
+    """
+    outcomes = {}
+    scored = []
+    for turn, snapshot in entries:
+        if snapshot is None:
+            continue
+        if not snapshot["current_proposals"].strip() and not snapshot["decisions"].strip():
+            outcomes[turn] = ("No proposals or decisions provided. Skipping framework evaluation.", snapshot)
+            continue
+        reused_snapshot = dict(snapshot)
+        reused = reuse_similar_evaluation(snapshot["current_proposals"], snapshot["decisions"], reused_snapshot)
+        if reused is not None:
+            outcomes[turn] = (reused, reused_snapshot)
+        else:
+            scored.append((turn, snapshot))
+
+    if scored:
+        turns = [turn for turn, _ in scored]
+        evaluator_log.debug("Starting batched framework evaluation of turns %s (Metrics Evaluator)", turns)
+        messages = [
+            {"role": "system", "content": BATCH_EVALUATOR_SYSTEM_PROMPT},
+            {"role": "user", "content": build_batch_evaluation_prompt(scored)}
+        ]
+        max_tokens = EVALUATOR_MAX_TOKENS * len(scored)
+        if export_path:
+            request = completion_request(messages, max_tokens, evaluation_response_format(BATCH_EVALUATION_RESPONSE_FORMAT))
+            append_batch_request(export_path, "turns-" + "-".join(str(turn) for turn in turns), request)
+
+        results = {}
+        try:
+            response_text = request_evaluation(messages, max_tokens=max_tokens,
+                                               response_format=BATCH_EVALUATION_RESPONSE_FORMAT,
+                                               cache_if=batch_evaluation_validator(turns), call_site="evaluator_batch")
+            evaluator_log.debug("OpenAI response: %s", response_text)
+            results = parse_batch_evaluation(response_text, {turn: snapshot["political_leaning"] for turn, snapshot in scored})
+        except ValueError as e:
+            evaluator_log.warning("Failed to parse OpenAI response as a batch of evaluations: %s", e)
+        except Exception as e:
+            evaluator_log.exception("An error occurred during batched framework evaluation: %s", e)
+
+        for turn, snapshot in scored:
+            if turn not in results:
+                outcomes[turn] = ("Error: Failed to parse evaluation results.", snapshot)
+                continue
+            metrics, new_leaning = results[turn]
+            remember_evaluation(snapshot["current_proposals"], snapshot["decisions"], metrics, new_leaning)
+            outcomes[turn] = (
+                f"Framework evaluated. New metrics: {metrics}, New leaning: {new_leaning}",
+                dict(snapshot, metrics=metrics, political_leaning=new_leaning)
+            )
+        evaluator_log.info("Batched framework evaluation of turns %s: %d of %d turns scored.", turns, len(results), len(scored))
+
+    return [(turn, outcomes.get(turn)) for turn, _ in entries]
+
+def create_transfer_function(agent_name, agents=None):
+    """
+    Create the mesh-mode tool that hands the conversation to one specific agent.
 
-def create_transfer_function(agent_name):
+    Swarm looks tools up by function name, so each transfer function gets a name of its
+    own (e.g. `transfer_to_futurist`).
+
+    Args:
+    agent_name (str): The agent to transfer to.
+    agents (dict): The roster to look the agent up in. Defaults to `get_agents()`.
+    """
     def transfer(context_variables=None):
-        print(f"Transferring control to {agent_name}")
-        return agents[agent_name]
+        swarm_log.info("Transferring control to %s", agent_name)
+        return (agents if agents is not None else get_agents())[agent_name]
+    transfer.__name__ = "transfer_to_" + agent_name.lower().replace(" ", "_")
+    transfer.__qualname__ = transfer.__name__
+    transfer.__doc__ = f"Transfer the conversation to the {agent_name}."
     return transfer
 
+def create_routed_transfer_function(targets, agents=None):
+    """
+    Create the routed-mode tool that hands the conversation to any of `targets`.
+
+    The agent is chosen through the `agent_name` argument, which the Swarm client restricts
+    to `targets` in the tool schema, so each agent needs a single transfer tool.
+
+    Args:
+    targets (list): Names of the agents that can be transferred to.
+    agents (dict): The roster to look the agent up in. Defaults to `get_agents()`.
+    """
+    def transfer_to_agent(agent_name: str, context_variables=None):
+        """Transfer the conversation to another agent."""
+        if agent_name not in targets:
+            return f"Error: cannot transfer to '{agent_name}'. Choose one of: {', '.join(targets)}."
+        swarm_log.info("Transferring control to %s", agent_name)
+        return (agents if agents is not None else get_agents())[agent_name]
+    transfer_to_agent.handoff_targets = list(targets)
+    return transfer_to_agent
+
 agents_data = [
     {
         "name": "Director",
@@ -232,51 +824,149 @@ agents_data = [
     }
 ]
 
-# Create agents
-agents = {}
-for agent_data in agents_data:
-    agent_name = agent_data["name"]
-    agent_instructions = agent_data["instructions"]
-
-    # Create transfer functions for all agents except the Director
-    transfer_functions = []
-    if agent_name != "Director":
-        for other_agent in agents_data:
-            if other_agent["name"] != agent_name:
-                transfer_functions.append(create_transfer_function(other_agent["name"]))
-
-    # Add evaluate_framework function to all agents except Metrics Evaluator
-    if agent_name != "Metrics Evaluator":
-        transfer_functions.append(evaluate_framework)
-    else:
-        # Metrics Evaluator uses evaluate_metrics instead of evaluate_framework
-        transfer_functions = [evaluate_metrics]
+def load_handoff_routes(path: str) -> Dict[str, list]:
+    """
+    Read a routing graph for the routed handoff mode.
 
-    agents[agent_name] = Agent(
-        name=agent_name,
-        instructions=agent_instructions,
-        functions=transfer_functions,
-        model=OPENAI_MODEL
-    )
+    Args:
+    path (str): JSON file mapping agent names to the list of agents each may transfer to.
+    Agents that are not listed can transfer to every other agent.
+
+    Returns:
+    Dict[str, list]: The validated routing graph.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        routes = json.load(f)
+    known = {agent_data["name"] for agent_data in agents_data}
+    for source, targets in routes.items():
+        unknown = sorted(({source} | set(targets)) - known)
+        if unknown:
+            raise ValueError(f"Unknown agent(s) in handoff routes {path}: {', '.join(unknown)}.")
+    return routes
+
+def round_specialists(agents: Dict[str, Any], names: str = ROUND_SPECIALISTS) -> list:
+    """
+    Return the specialists that answer in round mode, in roster order.
 
-director_transfer_functions = [create_transfer_function(agent["name"]) for agent in agents_data if agent["name"] != "Director"]
-director_transfer_functions.append(evaluate_framework) 
-agents["Director"].functions = director_transfer_functions
+    Args:
+    agents (dict): The agents keyed by name.
+    names (str): Comma-separated agent names. Empty selects every agent except the Director
+    and the Metrics Evaluator.
+    """
+    selected = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = sorted(set(selected) - set(agents))
+    if unknown:
+        raise ValueError(f"Unknown agent(s) in ROUND_SPECIALISTS: {', '.join(unknown)}.")
+    if not selected:
+        selected = [name for name in agents if name not in ("Director", "Metrics Evaluator")]
+    return [agent for name, agent in agents.items() if name in selected]
+
+def build_agents(handoff_mode: str = HANDOFF_MODE, routes: Optional[Dict[str, list]] = None) -> Dict[str, Any]:
+    """
+    Create the Swarm agents described by `agents_data`, keyed by name.
 
-def summarize_messages(messages, summary_type, turn):
+    Args:
+    handoff_mode (str): "mesh" for one transfer function per target agent, "routed" for a
+    single transfer tool per agent.
+    routes (dict): Routing graph (see `load_handoff_routes()`). In routed mode it defaults to
+    `HANDOFF_ROUTES_PATH` if set; otherwise every agent can reach every other agent.
+    """
+    from swarm import Agent
+
+    if handoff_mode not in ("mesh", "routed"):
+        raise ValueError(f"Unknown HANDOFF_MODE '{handoff_mode}'. Use 'mesh' or 'routed'.")
+    if routes is None and handoff_mode == "routed" and HANDOFF_ROUTES_PATH:
+        routes = load_handoff_routes(HANDOFF_ROUTES_PATH)
+    routes = routes or {}
+
+    def handoff_functions(agent_name):
+        targets = routes.get(agent_name, [other["name"] for other in agents_data if other["name"] != agent_name])
+        if handoff_mode == "routed":
+            return [create_routed_transfer_function(targets, agents)] if targets else []
+        return [create_transfer_function(target, agents) for target in targets]
+
+    agents = {}
+    for agent_data in agents_data:
+        agent_name = agent_data["name"]
+        agent_instructions = agent_data["instructions"]
+
+        # Create transfer functions for all agents except the Director
+        transfer_functions = []
+        if agent_name != "Director":
+            transfer_functions.extend(handoff_functions(agent_name))
+
+        # Add evaluate_framework function to all agents except Metrics Evaluator
+        if agent_name != "Metrics Evaluator":
+            transfer_functions.append(evaluate_framework)
+        else:
+            # Metrics Evaluator uses evaluate_metrics instead of evaluate_framework
+            transfer_functions = [evaluate_metrics]
+
+        agents[agent_name] = Agent(
+            name=agent_name,
+            instructions=agent_instructions,
+            functions=transfer_functions,
+            model=OPENAI_MODEL
+        )
+
+    director_transfer_functions = handoff_functions("Director")
+    director_transfer_functions.append(evaluate_framework)
+    agents["Director"].functions = director_transfer_functions
+    return agents
+
+def get_agents() -> Dict[str, Any]:
+    """Return the Swarm agents keyed by name, building them on first use."""
+    global _agents
+    if _agents is None:
+        with _lazy_init_lock:
+            if _agents is None:
+                _agents = build_agents()
+    return _agents
+
+def __getattr__(name):
+    # Keeps `optimal_politics_swarm.client`, `.agents` and `.response_cache` working while
+    # deferring their construction until they are first accessed
+    if name == "client":
+        return get_client()
+    if name == "agents":
+        return get_agents()
+    if name == "response_cache":
+        return get_response_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Agent system prompts mapped to agent names, to attribute Swarm requests to the agent making them
+_agent_names_by_instructions = {agent_data["instructions"]: agent_data["name"] for agent_data in agents_data}
+
+def agent_call_site(request) -> str:
+    """Return the call-site name of a Swarm completion request, based on its system prompt."""
+    messages = request.get("messages") or [{}]
+    name = _agent_names_by_instructions.get(messages[0].get("content"), "unknown")
+    return f"agent:{name}"
+
+SUMMARIZER_SYSTEM_PROMPT = """You are a helpful assistant that summarizes conversations. You are tasked with summarizing the conversation snippets given in the user message.
+
+**Instructions:**
+- Provide a clear and friendly summary of the key points and developments.
+- Focus on the main ideas, proposals, decisions, and any significant changes in metrics or political leaning.
+- The summary should be easy to read and understand.
+- Follow the summary type and the instruction given before the content.
+"""
+
+def summarize_messages(messages, summary_type, turn, use_cache=True):
     """
     Summarize a list of messages using the OpenAI Chat Completion API.
 
     Args:
     messages (str): The concatenated messages to summarize.
-    summary_type (str): The type of summary ('10-turn', '100-turn', '1000-turn', 'final').
+    summary_type (str): The type of summary ('10-turn', '100-turn', '1000-turn', ..., 'final').
     turn (int): The current turn number.
+    use_cache (bool): Whether the response cache may be used for this call.
 
     Returns:
     str: The summary as a string.
     """
     try:
-        print(f"\n--- Summarizing {summary_type} ---")
+        summarizer_log.debug("Summarizing %s at turn %d", summary_type, turn)
         # Prepare the prompt
         if summary_type == '10-turn':
             instruction = "Summarize the key points and developments from the last 10 turns of the conversation in a clear and concise manner."
@@ -284,90 +974,134 @@ def summarize_messages(messages, summary_type, turn):
             instruction = "Summarize the key points and developments from the last 100 turns of the conversation based on the provided 10-turn summaries."
         elif summary_type == '1000-turn':
             instruction = "Summarize the key points and developments from the last 1000 turns of the conversation based on the provided 100-turn summaries."
+        elif summary_type.endswith('-turn'):
+            instruction = f"Summarize the key points and developments from the last {summary_type[:-len('-turn')]} turns of the conversation based on the provided lower-level summaries."
         elif summary_type == 'final':
             instruction = "Provide a comprehensive summary of the conversation based on the provided high-level summaries and recent messages."
         else:
             instruction = "Summarize the provided content."
 
-        prompt = f"""
-You are an AI assistant tasked with summarizing the following conversation snippets.
-
-**Instructions:**
-- Provide a clear and friendly summary of the key points and developments.
-- Focus on the main ideas, proposals, decisions, and any significant changes in metrics or political leaning.
-- The summary should be easy to read and understand.
+        # Static instructions first (a cacheable prefix shared by every summary), content last
+        prompt = f"""**Summary Type:** {summary_type}
+{instruction}
 
 **Content to Summarize:**
 {messages}
-
-**Summary Type:** {summary_type}
 """
 
-        # Call the OpenAI Chat Completion API using the client object
-        completion = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes conversations."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=OPENAI_TEMPERATURE,
-            max_tokens=OPENAI_MAX_TOKENS,
-            n=1,
-            stop=None
-        )
-
-        # Extract the summary
-        summary = completion.choices[0].message.content.strip()
-        print(f"Generated {summary_type} summary:\n{summary}\n")
+        # Call the OpenAI Chat Completion API (or the response cache)
+        summary = request_completion([
+            {"role": "system", "content": SUMMARIZER_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ], use_cache=use_cache, call_site=f"summarizer:{summary_type}")
+        summarizer_log.info("Generated %s summary at turn %d.", summary_type, turn)
+        summarizer_log.debug("%s summary:\n%s", summary_type, summary)
 
-        # Write the summary to summary.txt
-        with open('summary.txt', 'a', encoding='utf-8') as f:
+        # Write the summary to summary.txt in the run's output directory
+        with open(get_run_config().output_path('summary.txt'), 'a', encoding='utf-8') as f:
             f.write(f"\n--- {summary_type.capitalize()} Summary at Turn {turn} ---\n")
             f.write(summary + "\n")
 
         return summary
 
     except Exception as e:
-        print(f"An error occurred during summarization: {str(e)}")
-        print("Traceback:")
-        traceback.print_exc()
+        summarizer_log.exception("An error occurred during summarization: %s", e)
         return ""
 
-def produce_final_summary(MAX_TURNS, last_10_turns_messages, last_10_summaries, last_100_summaries):
+def produce_final_summary(summaries: SummaryHierarchy, turn: int) -> str:
     """
-    Produce the final summary using the most recent high-level summaries as input.
+    Produce the final summary from the levels of the summary hierarchy that exist.
+
+    Args:
+    summaries (SummaryHierarchy): The run's rolling summaries.
+    turn (int): The last completed turn.
+
+    Returns:
+    str: The final summary.
     """
-    content_to_summarize = ""
-    # Collect the most recent 100-turn summaries
-    num_100_turn_summaries = MAX_TURNS // 100
-    if num_100_turn_summaries > 0 and last_100_summaries:
-        content_to_summarize += "\n".join(last_100_summaries[-num_100_turn_summaries:]) + "\n"
+    content_to_summarize = summaries.final_content()
+    if content_to_summarize.strip():
+        return summarize_messages(content_to_summarize, 'final', turn)
+    return "No additional summaries to produce."
 
-    # Collect the most recent 10-turn summaries after the last 100-turn summary
-    remaining_after_100s = MAX_TURNS % 100
-    num_10_turn_summaries = remaining_after_100s // 10
-    if num_10_turn_summaries > 0 and last_10_summaries:
-        content_to_summarize += "\n".join(last_10_summaries[-num_10_turn_summaries:]) + "\n"
+# Added to the Director's next request (and not kept in the history) when a turn repeated an earlier one
+REPETITION_HINT = "Note: {repeats} This was already discussed; do not revisit it, and move the framework on to an open issue."
 
-    # Collect any remaining messages
-    remaining_turns = remaining_after_100s % 10
-    if remaining_turns > 0 and last_10_turns_messages:
-        # Get the last 'remaining_turns' messages
-        content_to_summarize += "\n".join(last_10_turns_messages[-remaining_turns:]) + "\n"
+def repetition_hint(repeats) -> str:
+    """Return the note telling the Director which replies of the last turn repeated which earlier turns."""
+    return REPETITION_HINT.format(repeats=" ".join(
+        f"The reply of the {sender or 'previous speaker'} repeated what was said at turn {match.payload['turn']}."
+        for sender, match in repeats
+    ))
 
-    # Now summarize
-    if content_to_summarize.strip():
-        final_summary = summarize_messages(content_to_summarize, 'final', MAX_TURNS)
-        return final_summary
-    else:
-        return "No additional summaries to produce."
+def configure_logging(debug=None):
+    """
+    Set up the simulation's logging from the LOG_* settings.
 
-def main():
-    global current_context_variables
-    print("Initializing Swarm client...")
-    client_swarm = Swarm()
+    Args:
+    debug (list): Subsystems (see `run_logging.SUBSYSTEMS`) whose debug output is turned on
+        for this process; an empty list turns it on for all of them. Defaults to none.
+    """
+    setup_logging(LOG_LEVEL, {
+        "swarm": LOG_LEVEL_SWARM,
+        "evaluator": LOG_LEVEL_EVALUATOR,
+        "summarizer": LOG_LEVEL_SUMMARIZER
+    }, LOG_CONSOLE_LEVEL)
+    if debug is not None:
+        enable_debug(debug)
+
+def main(config: Optional[RunConfig] = None, resume: bool = False, console_log: bool = True):
+    """
+    Run one simulation and write its summaries, results file, graph and run.log.
+
+    Args:
+    config (RunConfig): The run settings. Defaults to the environment configuration.
+    resume (bool): Continue from the run's latest checkpoint instead of starting at turn 1.
+    console_log (bool): Also show the run's log records on the console.
+    """
+    if config is None:
+        config = RunConfig()
+    os.makedirs(config.output_dir, exist_ok=True)
+    if not is_logging_configured():
+        configure_logging()
+    log_path = config.output_path("run.log")
+    if not resume:
+        truncate_file(log_path, 0)
+    with run_log(log_path, console=console_log, max_bytes=LOG_FILE_MAX_BYTES, backup_count=LOG_FILE_BACKUPS):
+        run_simulation(config, resume)
+
+def run_simulation(config: RunConfig, resume: bool = False):
+    """
+    Run the turn loop of one simulation; `main()` sets up the run's log around it.
 
-    print("Setting up initial context...")
+    Args:
+    config (RunConfig): The run settings.
+    resume (bool): Continue from the run's latest checkpoint instead of starting at turn 1.
+    """
+    _active_run_config.set(config)
+
+    log.info("Initializing Swarm client...")
+    call_recorder = CallRecorder()
+    _active_call_recorder.set(call_recorder)
+    from routed_swarm import RoutedSwarm
+
+    client_swarm = RoutedSwarm(client=InstrumentedClient(get_client(), _active_call_recorder.get, agent_call_site, on_usage=record_usage, scheduler=get_request_scheduler()))
+    if DELIBERATION_MODE not in ("handoff", "round"):
+        raise ValueError(f"Unknown DELIBERATION_MODE '{DELIBERATION_MODE}'. Use 'handoff' or 'round'.")
+    deliberation_round = None
+    if DELIBERATION_MODE == "round":
+        from deliberation_round import DeliberationRound
+
+        deliberation_round = DeliberationRound(
+            client_swarm,
+            get_agents()["Director"],
+            round_specialists(get_agents()),
+            max_workers=ROUND_WORKERS or None
+        )
+    token_usage = TokenUsage()
+    _active_token_usage.set(token_usage)
+
+    log.info("Setting up initial context...")
     current_context_variables = {
         "current_proposals": "",
         "decisions": "",
@@ -379,109 +1113,382 @@ def main():
         },
         "political_leaning": 0.0  # Start at center, -1 is far left, 1 is far right
     }
+    _active_context_variables.set(current_context_variables)
 
     initial_message = "Develop an optimal political framework to maximize societal evolution in economy, fairness, equality, and technological progress. Collaborate with other agents, propose ideas, and evaluate them. Consider the long-term effects of political leanings on these aspects."
 
     messages = [{"role": "user", "content": initial_message}]
 
-    # Variables to keep track of messages for summaries
-    last_10_turns_messages = []
-    last_10_summaries = []
-    last_100_summaries = []
+    # Rolling 10/100/1000/...-turn summaries, promoted level by level as windows complete
+    summaries = SummaryHierarchy(summarize_messages)
+
+    # Tracks the last evaluated state so unchanged turns skip the evaluator
+    incremental_evaluator = IncrementalEvaluator(EVALUATION_INTERVAL)
+
+    # Near-duplicate indices of the evaluated frameworks and of the agents' replies
+    evaluation_index = message_index = None
+    if SEMANTIC_DEDUP:
+        evaluation_index = MinHashIndex(SEMANTIC_DEDUP_THRESHOLD, max_items=SEMANTIC_INDEX_SIZE)
+        message_index = MinHashIndex(SEMANTIC_DEDUP_THRESHOLD, max_items=SEMANTIC_INDEX_SIZE)
+    _active_evaluation_index.set(evaluation_index)
+    pending_hint = None
+
+    # Buffers due evaluations so EVALUATION_BATCH_SIZE turns are scored with one request
+    evaluation_batch = EvaluationBatch(EVALUATION_BATCH_SIZE) if EVALUATION_BATCH_SIZE > 1 else None
+    batch_export_path = config.evaluation_batch_path if evaluation_batch is not None and EVALUATION_BATCH_EXPORT else None
+
+    # Pick up where the latest checkpoint left off; output written after it is discarded
+    start_turn = 0
+    checkpoint = load_checkpoint(config.checkpoint_path) if resume else None
+    if checkpoint is not None:
+        start_turn = checkpoint["turn"]
+        messages = checkpoint["messages"]
+        current_context_variables.clear()
+        current_context_variables.update(checkpoint["context_variables"])
+        summaries.load_state(checkpoint["summaries"])
+        incremental_evaluator.load_state(checkpoint["evaluator"])
+        if evaluation_index is not None and checkpoint.get("evaluation_index"):
+            evaluation_index.load_state(checkpoint["evaluation_index"])
+            message_index.load_state(checkpoint["message_index"])
+        pending_hint = checkpoint.get("pending_hint")
+        token_usage = TokenUsage(**checkpoint["usage"])
+        _active_token_usage.set(token_usage)
+        truncate_file(config.journal_path, checkpoint["journal_bytes"])
+        truncate_file(config.output_path('summary.txt'), checkpoint["summary_bytes"])
+        if batch_export_path:
+            truncate_file(batch_export_path, checkpoint.get("evaluation_batch_bytes", 0))
+        log.info("Resuming from the checkpoint saved after turn %d.", start_turn)
+    elif resume:
+        log.info("No checkpoint found at %s. Starting a new run.", config.checkpoint_path)
+    if checkpoint is None and batch_export_path:
+        truncate_file(batch_export_path, 0)
+
+    # Every turn is streamed to the journal; the final report is built from it
+    journal = RunJournal(config.journal_path, flush_every=JOURNAL_FLUSH_EVERY, append=checkpoint is not None)
+
+    def capture_state(completed_turn):
+        """Snapshot everything needed to continue the run after `completed_turn`."""
+        summary_path = config.output_path('summary.txt')
+        return {
+            "turn": completed_turn,
+            "config": asdict(config),
+            "messages": messages,
+            "context_variables": copy.deepcopy(current_context_variables),
+            "summaries": summaries.state_dict(),
+            "evaluator": incremental_evaluator.state_dict(),
+            "evaluation_index": evaluation_index.state_dict() if evaluation_index is not None else None,
+            "message_index": message_index.state_dict() if message_index is not None else None,
+            "pending_hint": pending_hint,
+            "usage": token_usage.snapshot(),
+            "journal_bytes": journal.bytes_written,
+            "summary_bytes": os.path.getsize(summary_path) if os.path.exists(summary_path) else 0,
+            "evaluation_batch_bytes": os.path.getsize(batch_export_path) if batch_export_path and os.path.exists(batch_export_path) else 0
+        }
+
+    def write_checkpoint(state):
+        # The journal must be on disk up to the offset the checkpoint refers to
+        journal.flush()
+        save_checkpoint(config.checkpoint_path, state)
+        log.info("Checkpoint saved after turn %d.", state["turn"])
+
+    # State at the end of the last completed turn, saved if the run is interrupted
+    last_completed_state = None
+
+    # Turn records waiting for their pipelined evaluation before being journaled
+    pending_turn_records = {}
+
+    def journal_turn(turn_record, evaluated):
+        """Complete a turn record with the current metrics and leaning and append it to the journal."""
+        turn_record["evaluated"] = evaluated
+        turn_record["metrics"] = dict(current_context_variables.get("metrics", {}))
+        turn_record["political_leaning"] = current_context_variables.get("political_leaning", 0.0)
+        journal.append(turn_record)
+
+    # Bounds the history sent to the agents by tokens rather than message count
+    context_window = ContextWindow(CONTEXT_TOKEN_BUDGET, model=config.model, trim_to=CONTEXT_TRIM_TARGET)
+
+    # In pipelined mode evaluations and summaries run on background workers
+    pipeline = TurnPipeline(EVALUATION_WORKERS) if config.pipelined else None
+    last_agent_evaluation_turn = 0
+
+    def merge_evaluations(results):
+        """Apply pipelined or batched evaluation results to the context and leaning history in turn order."""
+        for evaluated_turn, outcome in results:
+            if isinstance(outcome, list):
+                # A batch submitted to the pipeline: its per-turn results
+                merge_evaluations(outcome)
+                continue
+            turn_record = pending_turn_records.pop(evaluated_turn, {"event": "turn", "turn": evaluated_turn})
+            if outcome is None:
+                journal_turn(turn_record, evaluated=False)
+                continue
+            evaluation_result, snapshot = outcome
+            log.info("[Turn %d evaluation] %s", evaluated_turn, evaluation_result)
+            if evaluation_result.startswith("Error"):
+                # Like a failed synchronous evaluation, the state is retried on the next turn; the
+                # turn keeps the previous metrics, and the journal says they are not its own
+                log.warning("Evaluation of turn %d failed; its state will be evaluated again.", evaluated_turn)
+                turn_record["evaluation_failed"] = True
+                incremental_evaluator.fail(evaluated_turn)
+            # Skip results older than an evaluation the agents ran through their own tools
+            elif last_agent_evaluation_turn <= evaluated_turn:
+                current_context_variables["metrics"] = snapshot["metrics"]
+                current_context_variables["political_leaning"] = snapshot["political_leaning"]
+                incremental_evaluator.record(
+                    evaluated_turn,
+                    snapshot["current_proposals"],
+                    snapshot["decisions"],
+                    snapshot["political_leaning"]
+                )
+            journal_turn(turn_record, evaluated=True)
+
+    def flush_evaluation_batch():
+        """Score the buffered snapshots with one request (on a worker in pipelined mode) and merge the results."""
+        entries = evaluation_batch.take()
+        if not entries:
+            return
+        if pipeline is not None:
+            pipeline.submit_evaluation(entries[-1][0], evaluate_snapshots, entries, batch_export_path)
+        else:
+            merge_evaluations(evaluate_snapshots(entries, batch_export_path))
 
-    # List to store political leaning over time
-    political_leanings_over_time = []
+    final_summary = ""
 
     try:
-        for turn in range(MAX_TURNS):
+        for turn in range(start_turn, config.max_turns):
             current_turn = turn + 1
-            print(f"\n--- Turn {current_turn} ---")
-            response = client_swarm.run(
-                agent=agents["Director"],
-                messages=messages,
-                context_variables=current_context_variables,
-                max_turns=1,
-                debug=True
-            )
+            log.info("--- Turn %d ---", current_turn)
+            turn_started = time.monotonic()
+            usage_before = token_usage.snapshot()
+            evaluated = False
+
+            # Fold in whichever background evaluations have finished, oldest first
+            if pipeline is not None:
+                merge_evaluations(pipeline.collect())
+
+            # The repetition hint steers this turn's requests only
+            request_messages = messages + [{"role": "user", "content": pending_hint}] if pending_hint else messages
+            pending_hint = None
+
+            if deliberation_round is not None:
+                # Question, concurrent specialist answers and the Director's synthesis
+                response = deliberation_round.run(request_messages, current_context_variables, model=config.model)
+            else:
+                response = client_swarm.run(
+                    agent=get_agents()["Director"],
+                    messages=request_messages,
+                    context_variables=current_context_variables,
+                    model_override=config.model,
+                    max_turns=1
+                )
 
             # Update context and messages
+            if (pipeline is not None or evaluation_batch is not None) and (
+                    response.context_variables.get("metrics") != current_context_variables.get("metrics")
+                    or response.context_variables.get("political_leaning") != current_context_variables.get("political_leaning")):
+                last_agent_evaluation_turn = current_turn
             current_context_variables.update(response.context_variables)
-            messages = response.messages
-
-            # *** Optimization: Limit the size of messages to save memory ***
-            MAX_MESSAGES = 100  # Limit messages to last 100 messages
-            if len(messages) > MAX_MESSAGES:
-                messages = messages[-MAX_MESSAGES:]
-
-            # Collect messages for summarization
+            # Swarm returns only the messages added during this run
+            messages = messages + response.messages
+
+            # Keep the history under the token budget; evicted turns are represented by the rolling summaries
+            messages, evicted = context_window.fit(messages, summaries.context_note())
+            if evicted:
+                log.debug("Evicted %d messages from the context window (%d tokens kept).", len(evicted), context_window.history_tokens(messages))
+
+            # Look for replies that repeat earlier ones
+            repeats = {}
+            if message_index is not None:
+                for position, message in enumerate(response.messages):
+                    if message.get("role") != "assistant" or not message.get("content"):
+                        continue
+                    match = message_index.query_and_add(f"{current_turn}:{position}", message["content"],
+                                                        {"turn": current_turn, "sender": message.get("sender")})
+                    if match is not None:
+                        repeats[position] = (message.get("sender"), match)
+                if repeats:
+                    log.info("Turn %d repeated turn(s) %s.", current_turn, sorted({match.payload["turn"] for _, match in repeats.values()}))
+                    if SEMANTIC_DEDUP_HINTS:
+                        pending_hint = repetition_hint(repeats.values())
+
+            # Collect messages for summarization; a repeated reply is only referenced
             last_message_content = response.messages[-1]['content'] if response.messages else ''
-            last_10_turns_messages.append(last_message_content)
-            if len(last_10_turns_messages) > 10:
-                last_10_turns_messages.pop(0)
+            if response.messages and len(response.messages) - 1 in repeats:
+                sender, match = repeats[len(response.messages) - 1]
+                last_message_content = f"({sender or 'An agent'} repeated the point made at turn {match.payload['turn']}.)"
+            summaries.add(last_message_content)
 
-            # Evaluate the framework
+            # Evaluate the framework, reusing the last metrics if nothing changed since then
             if "current_proposals" in current_context_variables and "decisions" in current_context_variables:
-                evaluation_result = evaluate_framework(
-                    current_context_variables.get("current_proposals", ""),
-                    current_context_variables.get("decisions", ""),
-                    current_context_variables.get("political_leaning", 0.0),
-                    context_variables=current_context_variables
-                )
-                print(evaluation_result)
-
-                # Store political leaning over time
-                political_leanings_over_time.append(current_context_variables.get("political_leaning", 0.0))
-
-            # Print current state
-            print("\nCurrent Proposals:", current_context_variables.get("current_proposals", ""))
-            print("\nCurrent Decisions:", current_context_variables.get("decisions", ""))
-            print("\nCurrent Metrics:", current_context_variables.get("metrics", {}))
-            print("Current Political Leaning:", current_context_variables.get("political_leaning", 0.0))
-
-            # Summarize every 10 turns
-            if current_turn % 10 == 0:
-                summary = summarize_messages("\n".join(last_10_turns_messages), '10-turn', current_turn)
-                last_10_summaries.append(summary)
-                if len(last_10_summaries) > 10:
-                    last_10_summaries.pop(0)
-
-            # Summarize every 100 turns using last 10 summaries
-            if current_turn % 100 == 0:
-                summary = summarize_messages("\n".join(last_10_summaries), '100-turn', current_turn)
-                last_100_summaries.append(summary)
-                if len(last_100_summaries) > 10:
-                    last_100_summaries.pop(0)
-
-            # Summarize every 1000 turns using last 100 summaries
-            if current_turn % 1000 == 0:
-                summary = summarize_messages("\n".join(last_100_summaries), '1000-turn', current_turn)
-                last_10_turns_messages = []
-                last_10_summaries = []
-                last_100_summaries = []
-
-        # After all turns, write final summaries if not already written
-        if (MAX_TURNS) % 10 != 0 and last_10_turns_messages:
-            summary = summarize_messages("\n".join(last_10_turns_messages), '10-turn', MAX_TURNS)
-            last_10_summaries.append(summary)
-
-        if (MAX_TURNS) % 100 != 0 and last_10_summaries:
-            summary = summarize_messages("\n".join(last_10_summaries), '100-turn', MAX_TURNS)
-            last_100_summaries.append(summary)
-
-        if (MAX_TURNS) % 1000 != 0 and last_100_summaries:
-            summary = summarize_messages("\n".join(last_100_summaries), '1000-turn', MAX_TURNS)
-
-        # Produce the final summary
-        final_summary = produce_final_summary(
-            MAX_TURNS,
-            last_10_turns_messages,
-            last_10_summaries,
-            last_100_summaries
-        )
+                proposals = current_context_variables.get("current_proposals", "")
+                decisions = current_context_variables.get("decisions", "")
+                leaning = current_context_variables.get("political_leaning", 0.0)
+                if not incremental_evaluator.is_due(current_turn, proposals, decisions, leaning):
+                    incremental_evaluator.reuses += 1
+                    log.debug("Proposals, decisions and leaning unchanged since turn %s. Reusing last metrics.", incremental_evaluator.last_turn)
+                    if evaluation_batch is not None and evaluation_batch.entries:
+                        # Keep the turn behind the buffered ones so the history stays in turn order
+                        evaluation_batch.add(current_turn, None)
+                    elif pipeline is not None:
+                        pipeline.record_skip(current_turn)
+                elif evaluation_batch is not None:
+                    snapshot = {
+                        "current_proposals": proposals,
+                        "decisions": decisions,
+                        "metrics": dict(current_context_variables.get("metrics", {})),
+                        "political_leaning": leaning
+                    }
+                    incremental_evaluator.mark_pending(current_turn, proposals, decisions, leaning)
+                    evaluation_batch.add(current_turn, snapshot)
+                elif pipeline is not None:
+                    pipeline.submit_evaluation(
+                        current_turn,
+                        evaluate_snapshot,
+                        proposals,
+                        decisions,
+                        leaning,
+                        current_context_variables.get("metrics", {})
+                    )
+                    incremental_evaluator.mark_pending(current_turn, proposals, decisions, leaning)
+                else:
+                    evaluation_result = evaluate_framework(
+                        proposals,
+                        decisions,
+                        leaning,
+                        context_variables=current_context_variables
+                    )
+                    log.debug(evaluation_result)
+                    evaluated = True
+                    # Failed evaluations are not recorded so the next turn retries them
+                    if not evaluation_result.startswith("Error"):
+                        incremental_evaluator.record(
+                            current_turn,
+                            proposals,
+                            decisions,
+                            current_context_variables.get("political_leaning", 0.0)
+                        )
+            elif evaluation_batch is not None and evaluation_batch.entries:
+                evaluation_batch.add(current_turn, None)
+            elif pipeline is not None:
+                pipeline.record_skip(current_turn)
+
+            # Log the current state; the full proposals and decisions only at DEBUG level
+            log.debug("Current Proposals: %s", current_context_variables.get("current_proposals", ""))
+            log.debug("Current Decisions: %s", current_context_variables.get("decisions", ""))
+            log.info("Current Metrics: %s", current_context_variables.get("metrics", {}))
+            log.info("Current Political Leaning: %s", current_context_variables.get("political_leaning", 0.0))
+
+            # Summarize every 10 turns, and every 100, 1000, ... turns from the level below
+            if summaries.is_due(current_turn):
+                if pipeline is not None:
+                    pipeline.submit_summaries(summaries.promote, current_turn, summaries.take_window())
+                else:
+                    summaries.promote(current_turn, summaries.take_window())
+
+            # Journal the turn (pipelined and batched turns are journaled once their evaluation is merged)
+            usage_after = token_usage.snapshot()
+            turn_record = {
+                "event": "turn",
+                "turn": current_turn,
+                "agent": response.agent.name if response.agent else None,
+                "latency": round(time.monotonic() - turn_started, 3),
+                "usage": {name: usage_after[name] - usage_before[name] for name in usage_after}
+            }
+            if repeats:
+                turn_record["repeats"] = sorted({match.payload["turn"] for _, match in repeats.values()})
+            if pipeline is not None or (evaluation_batch is not None and evaluation_batch.entries):
+                pending_turn_records[current_turn] = turn_record
+            else:
+                journal_turn(turn_record, evaluated)
+            if evaluation_batch is not None and evaluation_batch.is_full:
+                flush_evaluation_batch()
+
+            # Checkpoint the completed turn; pipelined and batched work is finished first so the state is consistent
+            if pipeline is None and not (evaluation_batch is not None and evaluation_batch.entries):
+                last_completed_state = capture_state(current_turn)
+            if CHECKPOINT_EVERY > 0 and current_turn % CHECKPOINT_EVERY == 0:
+                if evaluation_batch is not None:
+                    flush_evaluation_batch()
+                if pipeline is not None:
+                    merge_evaluations(pipeline.drain())
+                last_completed_state = capture_state(current_turn)
+                write_checkpoint(last_completed_state)
+
+        # Score the partly filled last batch and wait for background work so the final summaries see every result
+        if evaluation_batch is not None:
+            flush_evaluation_batch()
+        if pipeline is not None:
+            merge_evaluations(pipeline.drain())
+
+        # Produce the final summary from whatever summary levels the run reached
+        final_summary = produce_final_summary(summaries, config.max_turns)
+
+    except KeyboardInterrupt:
+        log.warning("Run interrupted.")
+        if last_completed_state is not None:
+            write_checkpoint(last_completed_state)
+        journal.close()
+        # Requests already sent finish (and reach the response cache, so a resumed run does
+        # not pay for them again); queued ones are dropped and redone after --resume
+        if pipeline is not None:
+            pipeline.shutdown(cancel=True)
+        if deliberation_round is not None:
+            deliberation_round.shutdown()
+        raise
 
     except Exception as e:
-        print(f"An error occurred: {e}")
-        traceback.print_exc()
+        log.exception("An error occurred: %s", e)
+        # Keep the last completed turn so the run can be resumed with --resume
+        if last_completed_state is not None:
+            write_checkpoint(last_completed_state)
+
+    if pipeline is not None or evaluation_batch is not None:
+        try:
+            if evaluation_batch is not None:
+                flush_evaluation_batch()
+            if pipeline is not None:
+                merge_evaluations(pipeline.drain())
+        except Exception as e:
+            log.exception("An error occurred while finishing background evaluations: %s", e)
+        if pipeline is not None:
+            pipeline.shutdown()
+    if deliberation_round is not None:
+        deliberation_round.shutdown()
+
+    # Close the journal with the final state of the run
+    journal.append({
+        "event": "final",
+        "proposals": current_context_variables.get("current_proposals", ""),
+        "decisions": current_context_variables.get("decisions", ""),
+        "metrics": current_context_variables.get("metrics", {}),
+        "political_leaning": current_context_variables.get("political_leaning", 0.0),
+        "final_summary": final_summary,
+        "evaluations": incremental_evaluator.evaluations,
+        "reused_evaluations": incremental_evaluator.reuses,
+        "evaluation_batches": evaluation_batch.batches if evaluation_batch is not None else 0,
+        "similar_evaluations": evaluation_index.hits if evaluation_index is not None else 0,
+        "repeated_replies": message_index.hits if message_index is not None else 0,
+        "usage": token_usage.snapshot()
+    })
+    journal.close()
+
+    # Report where time, tokens and money went
+    log.info("Completion calls by call site:\n%s", call_recorder.format_table())
+    call_recorder.export_json(config.call_stats_path)
+    log.info("Call statistics have been written to %s", config.call_stats_path)
+
+    write_final_report(config)
+
+def write_final_report(config: RunConfig):
+    """
+    Write the results file and the political leaning graph of a run from its journal.
+
+    Args:
+    config (RunConfig): The configuration of the run whose journal is read.
+    """
+    turn_records, final = load_journal(config.journal_path)
+    final = final or {}
+    political_leanings_over_time = [record["political_leaning"] for record in turn_records]
 
     # Compute average and standard deviation of political leaning
     if political_leanings_over_time:
@@ -494,46 +1501,58 @@ def main():
         avg_leaning = 0.0
         std_leaning = 0.0
 
-    # Print final results
-    print("\nFinal Political Framework:")
-    print(current_context_variables.get("current_proposals", ""))
-    print("\nFinal Decisions:")
-    print(current_context_variables.get("decisions", ""))
-    print("\nFinal Metrics:", current_context_variables.get("metrics", {}))
-    print("Final Political Leaning:", current_context_variables.get("political_leaning", 0.0))
-    print(f"Average Political Leaning: {avg_leaning}")
-    print(f"Standard Deviation of Political Leaning: {std_leaning}")
+    # Log final results
+    log.info("Final Political Framework:\n%s", final.get("proposals", ""))
+    log.info("Final Decisions:\n%s", final.get("decisions", ""))
+    log.info("Final Metrics: %s", final.get("metrics", {}))
+    log.info("Final Political Leaning: %s", final.get("political_leaning", 0.0))
+    log.info("Average Political Leaning: %s", avg_leaning)
+    log.info("Standard Deviation of Political Leaning: %s", std_leaning)
+    log.info("Evaluations run: %s, reused: %s, near-duplicates reused: %s", final.get("evaluations", 0),
+             final.get("reused_evaluations", 0), final.get("similar_evaluations", 0))
 
     # Generate the filename
-    filename = f"results_{MAX_TURNS}_{OPENAI_TEMPERATURE}.txt"
+    filename = config.output_path(f"results_{config.max_turns}_{config.temperature}.txt")
 
     # Prepare the final results content
-    final_results = f"Final Political Framework:\n{current_context_variables.get('current_proposals', '')}\n\n"
-    final_results += f"Final Decisions:\n{current_context_variables.get('decisions', '')}\n\n"
-    final_results += f"Final Metrics: {current_context_variables.get('metrics', {})}\n"
-    final_results += f"Final Political Leaning: {current_context_variables.get('political_leaning', 0.0)}\n"
+    final_results = f"Final Political Framework:\n{final.get('proposals', '')}\n\n"
+    final_results += f"Final Decisions:\n{final.get('decisions', '')}\n\n"
+    final_results += f"Final Metrics: {final.get('metrics', {})}\n"
+    final_results += f"Final Political Leaning: {final.get('political_leaning', 0.0)}\n"
     final_results += f"Average Political Leaning: {avg_leaning}\n"
     final_results += f"Standard Deviation of Political Leaning: {std_leaning}\n"
-    final_results += f"Final Summary:\n{final_summary}\n"
+    final_results += f"Final Summary:\n{final.get('final_summary', '')}\n"
 
     # Write the final results to the file
     with open(filename, 'w', encoding='utf-8') as f:
         f.write(final_results)
 
-    print(f"\nFinal results have been written to {filename}")
+    log.info("Final results have been written to %s", filename)
 
-    # Plot the graph of political leaning over time with dynamic filename
+    # Plot the political leaning and the four metrics over time with dynamic filename
     if political_leanings_over_time:
-        plt.figure(figsize=(10, 5))
-        plt.plot(range(1, len(political_leanings_over_time) + 1), political_leanings_over_time, marker='o')
-        plt.title('Political Leaning Over Time')
-        plt.xlabel('Turn')
-        plt.ylabel('Political Leaning')
-        plt.grid(True)
-        graph_filename = f"political_leaning_over_time_{MAX_TURNS}_{OPENAI_TEMPERATURE}.png"
-        plt.savefig(graph_filename)
-        plt.show()
-        print(f"Political leaning over time graph saved as '{graph_filename}'")
+        from plotting import plot_run
+
+        turns = [record["turn"] for record in turn_records]
+        series = {"political_leaning": political_leanings_over_time}
+        for metric in ("economy", "fairness", "equality", "technological_progress"):
+            series[metric] = [record.get("metrics", {}).get(metric, float("nan")) for record in turn_records]
+        graph_filename = config.output_path(f"political_leaning_over_time_{config.max_turns}_{config.temperature}.png")
+        plot_run(turns, series, graph_filename)
+        log.info("Political leaning over time graph saved as '%s'", graph_filename)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Develop a political framework with a swarm of expert agents.")
+    parser.add_argument("--resume", action="store_true", help="Continue from the latest checkpoint of this configuration.")
+    add_debug_argument(parser)
+    return parser.parse_args(argv)
+
+def add_debug_argument(parser):
+    """Add the `--debug [SUBSYSTEM ...]` option that turns on debug output for one invocation."""
+    parser.add_argument("--debug", nargs="*", choices=SUBSYSTEMS, metavar="SUBSYSTEM",
+                        help=f"Log debug output of these subsystems ({', '.join(SUBSYSTEMS)}; all if none are given).")
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    configure_logging(args.debug)
+    main(resume=args.resume)
@@ -0,0 +1,189 @@
+import argparse
+import sys
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+# The Figure API renders straight to an Agg canvas: no pyplot global state, no GUI
+# backend and no show(), so runs on headless servers and worker threads can plot safely
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+# Upper bound on the points drawn per line; longer series are downsampled
+DEFAULT_MAX_POINTS = 2000
+
+SERIES_STYLES = {
+    "political_leaning": {"label": "Political leaning", "color": "black", "linewidth": 1.8},
+    "economy": {"label": "Economy", "color": "tab:blue", "linewidth": 1.0},
+    "fairness": {"label": "Fairness", "color": "tab:orange", "linewidth": 1.0},
+    "equality": {"label": "Equality", "color": "tab:green", "linewidth": 1.0},
+    "technological_progress": {"label": "Technological progress", "color": "tab:red", "linewidth": 1.0},
+}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each of `max_points - 2` buckets, the point
+    forming the largest triangle with the previously kept point and the next bucket's
+    average, which preserves peaks and trends far better than striding.
+
+    Args:
+    x (np.ndarray): Increasing x values.
+    y (np.ndarray): The values; points where `y` is NaN are dropped first.
+    max_points (int): Number of points to keep.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: The kept x and y values.
+    """
+    keep = ~np.isnan(y)
+    x, y = np.asarray(x, dtype=float)[keep], np.asarray(y, dtype=float)[keep]
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = np.empty(max_points, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x, next_y = x[end:edges[bucket + 2]].mean(), y[end:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return x[selected], y[selected]
+
+
+def minmax_decimate(y: np.ndarray, buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample many series at once, keeping each bucket's minimum and maximum.
+
+    Vectorized over runs, so thousands of runs are reduced in a few array operations.
+    The two extremes of a bucket are emitted in the order they occur, so spikes survive.
+
+    Args:
+    y (np.ndarray): (runs, turns) values, NaN-padded.
+    buckets (int): Number of buckets; each contributes two points.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: 0-based turn positions and values, both (runs, 2 * buckets).
+    """
+    runs, turns = y.shape
+    if turns <= 2 * buckets:
+        return np.broadcast_to(np.arange(turns, dtype=float), y.shape), y
+    size = -(-turns // buckets)
+    padded = np.full((runs, buckets * size), np.nan)
+    padded[:, :turns] = y
+    blocks = padded.reshape(runs, buckets, size)
+
+    empty = np.isnan(blocks).all(axis=2)
+    low = np.argmin(np.where(np.isnan(blocks), np.inf, blocks), axis=2)
+    high = np.argmax(np.where(np.isnan(blocks), -np.inf, blocks), axis=2)
+    first, second = np.minimum(low, high), np.maximum(low, high)
+    offsets = np.arange(buckets) * size
+    positions = np.stack([offsets + first, offsets + second], axis=2).reshape(runs, -1).astype(float)
+    values = np.stack([np.take_along_axis(blocks, first[..., None], 2)[..., 0],
+                       np.take_along_axis(blocks, second[..., None], 2)[..., 0]], axis=2)
+    values[np.repeat(empty[..., None], 2, axis=2)] = np.nan
+    return positions, values.reshape(runs, -1)
+
+
+def _save(figure: Figure, path: str) -> None:
+    FigureCanvasAgg(figure)
+    figure.savefig(path)
+
+
+def plot_run(turns: Sequence[int], series: Dict[str, Sequence[float]], path: str, title: str = "Political Leaning and Metrics Over Time",
+             max_points: int = DEFAULT_MAX_POINTS) -> None:
+    """
+    Plot the leaning and the metrics of one run on shared axes and save the figure.
+
+    Args:
+    turns (Sequence[int]): Turn numbers.
+    series (Dict[str, Sequence[float]]): Values per turn keyed by series name (see `SERIES_STYLES`).
+    path (str): Image file to write.
+    title (str): Figure title.
+    max_points (int): Maximum points drawn per series (LTTB downsampling).
+    """
+    figure = Figure(figsize=(10, 5))
+    axes = figure.add_subplot()
+    for name, values in series.items():
+        x, y = lttb(np.asarray(turns, dtype=float), np.asarray(values, dtype=float), max_points)
+        axes.plot(x, y, **SERIES_STYLES.get(name, {"label": name}))
+    axes.axhline(0.0, color="grey", linewidth=0.5)
+    axes.set_title(title)
+    axes.set_xlabel("Turn")
+    axes.set_ylabel("Value (leaning in [-1, 1], metrics in [0, 1])")
+    axes.set_ylim(-1.05, 1.05)
+    axes.grid(True)
+    axes.legend(loc="lower left", fontsize="small")
+    figure.tight_layout()
+    _save(figure, path)
+
+
+def plot_overlay(values: np.ndarray, path: str, title: str = "Political Leaning Over Time (all runs)",
+                 label: str = "Political leaning", buckets: int = DEFAULT_MAX_POINTS // 2) -> None:
+    """
+    Overlay one series of many runs, plus the mean across runs, and save the figure.
+
+    All runs are drawn in a single pass as one `LineCollection` after min/max decimation,
+    instead of one `plot()` call (and artist) per run.
+
+    Args:
+    values (np.ndarray): (runs, turns) values, NaN-padded after each run's end.
+    path (str): Image file to write.
+    title (str): Figure title.
+    label (str): Name of the series, for the y axis.
+    buckets (int): Decimation buckets per run.
+    """
+    positions, decimated = minmax_decimate(values, buckets)
+    segments = np.stack([positions + 1, decimated], axis=2)
+    alpha = float(np.clip(5.0 / max(len(values), 1), 0.02, 0.6))
+
+    figure = Figure(figsize=(10, 5))
+    axes = figure.add_subplot()
+    axes.add_collection(LineCollection(segments, colors="tab:blue", linewidths=0.8, alpha=alpha))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(values, axis=0) / np.sum(~np.isnan(values), axis=0)
+    x, y = lttb(np.arange(1, values.shape[1] + 1, dtype=float), mean, 2 * buckets)
+    axes.plot(x, y, color="black", linewidth=1.8, label=f"Mean of {len(values)} runs")
+    axes.autoscale_view()
+    axes.set_title(title)
+    axes.set_xlabel("Turn")
+    axes.set_ylabel(label)
+    axes.grid(True)
+    axes.legend(loc="lower left", fontsize="small")
+    figure.tight_layout()
+    _save(figure, path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Overlay the political leaning of many runs in one figure.")
+    parser.add_argument("paths", nargs="+", help="Journal files or directories (searched recursively).")
+    parser.add_argument("--output", default="leaning_overlay.png", help="Image file to write.")
+    parser.add_argument("--series", default="political_leaning", help="Series to overlay, e.g. economy.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    from run_analysis import load_runs
+
+    args = parse_args(argv)
+    runs = load_runs(args.paths)
+    if not runs.paths:
+        print("No run journals found.")
+        return 1
+    plot_overlay(runs.get(args.series), args.output, title=f"{SERIES_STYLES[args.series]['label']} over time ({len(runs.paths)} runs)",
+                 label=SERIES_STYLES[args.series]["label"])
+    print(f"Overlay of {len(runs.paths)} runs saved as '{args.output}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+import email.utils
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# OpenAI SDK exceptions without a status code that are still transient
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"}
+# Rough characters-per-token ratio used to reserve tokens before a request is sent
+CHARS_PER_TOKEN = 4
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the API kept failing for longer than the circuit breaker is willing to wait."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for errors that are likely to go away when the request is repeated later."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Return the delay in seconds requested by the error response's Retry-After headers, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return max(0.0, float(milliseconds) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        # Retry-After may also be an HTTP date
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `per_minute` units per minute.
+
+    The bucket holds at most `burst_seconds` worth of units, so a quota can be used in
+    bursts without exceeding it over any minute. A rate of 0 disables the limit.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take `amount` units, sleeping until they are available.
+
+        Returns:
+        float: Seconds spent waiting.
+        """
+        if self.rate <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, amount: float) -> None:
+        """Take (or give back, if negative) units after the fact, e.g. once the real token usage is known."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests while the API keeps failing.
+
+    After `failure_threshold` consecutive retryable failures the circuit opens and callers
+    wait for `reset_timeout` seconds. Then a single probe request is let through: success
+    closes the circuit, failure opens it again for twice as long (up to `max_reset_timeout`).
+    Callers give up with `CircuitOpenError` once the circuit has been open for `give_up_after`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_reset_timeout: float = 300.0,
+                 give_up_after: float = 1800.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.give_up_after = give_up_after
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._first_opened_at = None
+        self._timeout = reset_timeout
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            with self._lock:
+                if self._opened_at is None:
+                    return
+                now = time.monotonic()
+                if now - self._first_opened_at > self.give_up_after:
+                    raise CircuitOpenError(f"The API has been failing for more than {self.give_up_after:.0f}s.")
+                remaining = self._opened_at + self._timeout - now
+                if remaining <= 0 and not self._probing:
+                    self._probing = True
+                    return
+            time.sleep(remaining if remaining > 0 else 0.5)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = self._first_opened_at = None
+            self._timeout = self.reset_timeout
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing:
+                self._probing = False
+                self._opened_at = time.monotonic()
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+            elif self._opened_at is None and self._failures >= self.failure_threshold:
+                self._opened_at = self._first_opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a probe that neither succeeded nor failed retryably (e.g. a bad request)."""
+        with self._lock:
+            self._probing = False
+
+
+class RequestScheduler:
+    """
+    Shared gate in front of every completion request.
+
+    Requests wait for the request-per-minute and token-per-minute buckets and for the
+    circuit breaker, and retryable failures are repeated with jittered exponential
+    backoff, honouring the API's Retry-After header. One scheduler is shared by all runs
+    of a process, so concurrent sweeps stay within the same quota together.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0, max_retries: int = 6,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0, breaker: Optional[CircuitBreaker] = None,
+                 default_max_tokens: int = 1024):
+        """
+        Args:
+        requests_per_minute (float): Request quota (0 = unlimited).
+        tokens_per_minute (float): Token quota, counted as prompt plus completion tokens (0 = unlimited).
+        max_retries (int): Retries of a request after a retryable failure.
+        backoff_base (float): Upper bound of the first backoff delay in seconds; doubles per retry.
+        backoff_max (float): Largest backoff delay in seconds.
+        breaker (CircuitBreaker): Circuit breaker to use. Defaults to a new one.
+        default_max_tokens (int): Completion tokens reserved for requests without `max_tokens`.
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.default_max_tokens = default_max_tokens
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+    def estimate_tokens(self, request: Dict[str, Any]) -> int:
+        """
+        Estimate the tokens a chat completion request will use, before sending it.
+
+        Counts characters instead of tokenizing, since this runs for every request and is
+        corrected with the reported usage afterwards.
+        """
+        characters = sum(len(message.get("content") or "") for message in request.get("messages") or [])
+        if request.get("tools"):
+            characters += len(json.dumps(request["tools"]))
+        return characters // CHARS_PER_TOKEN + (request.get("max_tokens") or self.default_max_tokens)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def call(self, request: Callable[[], Any], estimated_tokens: int = 0,
+             on_retry: Optional[Callable[[int, BaseException, float], None]] = None) -> Any:
+        """
+        Send a request through the limiter, retrying transient failures.
+
+        Args:
+        request (Callable[[], Any]): Sends the request and returns the completion.
+        estimated_tokens (int): Expected prompt plus completion tokens, reserved up front and
+            corrected with the reported usage afterwards.
+        on_retry (Callable): Called as `on_retry(attempt, error, delay)` before each retry.
+
+        Returns:
+        Any: The completion returned by `request`.
+        """
+        attempt = 0
+        while True:
+            self.breaker.acquire()
+            self.requests.acquire(1)
+            self.tokens.acquire(estimated_tokens)
+            try:
+                result = request()
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.release()
+                    raise
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                delay = retry_after(e)
+                delay = min(delay, self.backoff_max) if delay is not None else self.backoff(attempt)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            usage = getattr(result, "usage", None)
+            if usage is not None:
+                used = (getattr(usage, "prompt_tokens", 0) or 0) + (getattr(usage, "completion_tokens", 0) or 0)
+                self.tokens.adjust(used - estimated_tokens)
+            return result
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# Per-call switch used by `bypass()`; a ContextVar so worker threads started with
+# a copied context (asyncio.to_thread, executors) inherit the caller's setting.
+_bypass_cache = ContextVar("response_cache_bypass", default=False)
+
+
+class ResponseCache:
+    """
+    Content-addressed, size-bounded LRU cache for chat completion responses.
+
+    Entries are stored in a SQLite file keyed on a SHA-256 of the model, temperature,
+    max_tokens and the full message list, so identical requests made by different
+    processes or later runs are answered from disk instead of the API.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+        path (str): Location of the SQLite cache file.
+        max_bytes (int): Upper bound on the total size of cached responses. The least
+            recently used entries are evicted once it is exceeded.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int, messages: List[Dict[str, Any]], **extra: Any) -> str:
+        """
+        Build the cache key for a completion request.
+
+        Args:
+        model (str): The model name.
+        temperature (float): The sampling temperature.
+        max_tokens (int): The completion token limit.
+        messages (List[Dict[str, Any]]): The full message list sent to the API.
+        **extra: Any other request parameters that change the response (e.g. seed).
+
+        Returns:
+        str: A hex SHA-256 digest identifying the request.
+        """
+        payload = {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "messages": messages,
+        }
+        payload.update({name: value for name, value in extra.items() if value is not None})
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_bypassed() -> bool:
+        """Return True while inside a `bypass()` block."""
+        return _bypass_cache.get()
+
+    @staticmethod
+    @contextmanager
+    def bypass():
+        """Context manager that disables cache reads and writes for calls made inside it."""
+        token = _bypass_cache.set(True)
+        try:
+            yield
+        finally:
+            _bypass_cache.reset(token)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for `key`, or None, refreshing its LRU position on a hit."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store `value` under `key` and evict least recently used entries beyond `max_bytes`."""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
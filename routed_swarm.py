@@ -0,0 +1,102 @@
+import copy
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from swarm import Agent, Swarm
+from swarm.util import function_to_json
+
+from run_logging import get_logger
+
+# Name of the parameter Swarm fills in with the run's context instead of the model
+CONTEXT_VARIABLES_PARAMETER = "context_variables"
+
+log = get_logger("swarm")
+
+
+def handoff_targets(func) -> Optional[List[str]]:
+    """Return the agent names a routed transfer function may hand off to, or None for other functions."""
+    return getattr(func, "handoff_targets", None)
+
+
+def build_tool_schema(func) -> Dict[str, Any]:
+    """
+    Describe an agent function as a chat completion tool.
+
+    Like Swarm's own conversion, but the context variables are hidden from the model and
+    the `agent_name` parameter of a routed transfer function is restricted to the names in
+    its `handoff_targets`, so the model can only pick agents that are actually reachable.
+    """
+    tool = copy.deepcopy(function_to_json(func))
+    parameters = tool["function"]["parameters"]
+    parameters["properties"].pop(CONTEXT_VARIABLES_PARAMETER, None)
+    if CONTEXT_VARIABLES_PARAMETER in parameters["required"]:
+        parameters["required"].remove(CONTEXT_VARIABLES_PARAMETER)
+    targets = handoff_targets(func)
+    if targets is not None:
+        parameters["properties"]["agent_name"] = {
+            "type": "string",
+            "enum": list(targets),
+            "description": "Name of the agent that should continue the conversation.",
+        }
+    return tool
+
+
+class RoutedSwarm(Swarm):
+    """
+    Swarm client that builds each agent's tool schema once.
+
+    Swarm converts every agent function to JSON on every completion request; with the
+    all-to-all transfer mesh that is 17 functions per request. The schemas only depend on
+    the agent's functions, so they are cached per agent here. The cached schemas are also
+    where routed transfer functions get their enum of target agents.
+
+    Requests, replies and tool calls are logged to the "politics.swarm" logger at DEBUG
+    level instead of Swarm's `debug` printing, so they follow the run's logging setup.
+    """
+
+    def __init__(self, client=None):
+        super().__init__(client=client)
+        self._tools_cache: Dict[Any, List[Dict[str, Any]]] = {}
+        self._tools_lock = threading.Lock()
+
+    def tools_for(self, agent: Agent) -> List[Dict[str, Any]]:
+        """Return the (cached) tool schemas of an agent's functions."""
+        key = (agent.name, tuple(id(func) for func in agent.functions))
+        tools = self._tools_cache.get(key)
+        if tools is None:
+            tools = [build_tool_schema(func) for func in agent.functions]
+            with self._tools_lock:
+                tools = self._tools_cache.setdefault(key, tools)
+        return tools
+
+    def get_chat_completion(self, agent: Agent, history: List, context_variables: dict, model_override: str,
+                            stream: bool, debug: bool):
+        context_variables = defaultdict(str, context_variables)
+        instructions = agent.instructions(context_variables) if callable(agent.instructions) else agent.instructions
+        messages = [{"role": "system", "content": instructions}] + history
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Getting chat completion for %s: %s", agent.name, messages)
+
+        tools = self.tools_for(agent)
+        create_params = {
+            "model": model_override or agent.model,
+            "messages": messages,
+            "tools": tools or None,
+            "tool_choice": agent.tool_choice,
+            "stream": stream,
+        }
+        if tools:
+            create_params["parallel_tool_calls"] = agent.parallel_tool_calls
+        completion = self.client.chat.completions.create(**create_params)
+        if log.isEnabledFor(logging.DEBUG) and not stream:
+            message = completion.choices[0].message
+            log.debug("Received completion for %s: %s", agent.name, message.content or message.tool_calls)
+        return completion
+
+    def handle_tool_calls(self, tool_calls, functions, context_variables, debug):
+        if log.isEnabledFor(logging.DEBUG):
+            for tool_call in tool_calls:
+                log.debug("Processing tool call: %s with arguments %s", tool_call.function.name, tool_call.function.arguments)
+        return super().handle_tool_calls(tool_calls, functions, context_variables, debug)
@@ -0,0 +1,405 @@
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from run_journal import load_journal
+
+METRIC_NAMES = ["economy", "fairness", "equality", "technological_progress"]
+SERIES_NAMES = ["political_leaning"] + METRIC_NAMES
+
+# Batch runner directory names: {model}_turns{N}_temp{T}[_seed{S}]
+_SEED_SUFFIX = re.compile(r"_seed-?\d+$")
+_JOURNAL_NAME = re.compile(r"journal_(\d+)_(.+)\.jsonl$")
+
+
+@dataclass
+class RunSet:
+    """
+    Per-turn series of many runs, stacked into one array.
+
+    `series[s, r, t]` is the value of `SERIES_NAMES[s]` after turn `t + 1` of run `r`.
+    Runs shorter than the longest one are padded with NaN, and every statistic below
+    ignores the padding.
+    """
+    paths: List[str]
+    labels: List[str]
+    lengths: np.ndarray
+    series: np.ndarray
+
+    def get(self, name: str) -> np.ndarray:
+        """Return the (runs, turns) array of one series."""
+        return self.series[SERIES_NAMES.index(name)]
+
+    def subset(self, indices: np.ndarray) -> "RunSet":
+        """Return the runs at `indices`, trimmed to their longest length."""
+        lengths = self.lengths[indices]
+        width = int(lengths.max()) if len(lengths) else 0
+        return RunSet(
+            paths=[self.paths[i] for i in indices],
+            labels=[self.labels[i] for i in indices],
+            lengths=lengths,
+            series=self.series[:, indices, :width],
+        )
+
+
+def find_journals(paths: Sequence[str]) -> List[str]:
+    """Expand files and directories (searched recursively) into a sorted list of run journals."""
+    journals = set()
+    for path in paths:
+        if os.path.isdir(path):
+            journals.update(glob.glob(os.path.join(path, "**", "journal_*.jsonl"), recursive=True))
+        elif os.path.exists(path):
+            journals.add(path)
+    return sorted(journals)
+
+
+def config_label(path: str) -> str:
+    """
+    Name the configuration a journal belongs to, so the seeds of one configuration are grouped.
+
+    Journals written by the batch runner are labelled by their run directory without the seed
+    suffix; other journals by the MAX_TURNS and temperature in their file name.
+    """
+    directory = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    if "_turns" in directory and "_temp" in directory:
+        return _SEED_SUFFIX.sub("", directory)
+    match = _JOURNAL_NAME.search(os.path.basename(path))
+    return f"turns{match.group(1)}_temp{match.group(2)}" if match else os.path.basename(path)
+
+
+def load_runs(paths: Sequence[str]) -> RunSet:
+    """
+    Load the per-turn leaning and metric series of many runs.
+
+    Args:
+    paths (Sequence[str]): Journal files, or directories searched for `journal_*.jsonl`.
+
+    Returns:
+    RunSet: The stacked series. Journals without any turn record are skipped.
+    """
+    runs = []
+    for path in find_journals(paths):
+        turns, _ = load_journal(path)
+        if not turns:
+            continue
+        length = turns[-1]["turn"]
+        values = np.full((len(SERIES_NAMES), length), np.nan)
+        index = np.array([record["turn"] - 1 for record in turns])
+        values[0, index] = [record.get("political_leaning", np.nan) for record in turns]
+        for row, name in enumerate(METRIC_NAMES, start=1):
+            values[row, index] = [record.get("metrics", {}).get(name, np.nan) for record in turns]
+        runs.append((path, values))
+
+    width = max((values.shape[1] for _, values in runs), default=0)
+    series = np.full((len(SERIES_NAMES), len(runs), width), np.nan)
+    for r, (_, values) in enumerate(runs):
+        series[:, r, :values.shape[1]] = values
+    return RunSet(
+        paths=[path for path, _ in runs],
+        labels=[config_label(path) for path, _ in runs],
+        lengths=np.array([values.shape[1] for _, values in runs], dtype=int),
+        series=series,
+    )
+
+
+def final_values(x: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Return the value after the last turn of each run of a (runs, turns) array."""
+    return x[np.arange(x.shape[0]), lengths - 1]
+
+
+def mean_confidence_interval(x: np.ndarray, level: float = 0.95, axis: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Mean and normal-approximation confidence interval along an axis, ignoring NaN.
+
+    Args:
+    x (np.ndarray): The samples.
+    level (float): Confidence level of the interval.
+    axis (int): Axis holding the samples (the runs).
+
+    Returns:
+    Dict[str, np.ndarray]: "mean", "low", "high", "std" and the sample count "n".
+    """
+    n = np.sum(~np.isnan(x), axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(x, axis=axis) / n
+        centered = np.where(np.isnan(x), 0.0, x - np.expand_dims(mean, axis))
+        std = np.sqrt(np.sum(centered ** 2, axis=axis) / (n - 1))
+        half_width = NormalDist().inv_cdf(0.5 + level / 2) * std / np.sqrt(n)
+    return {"mean": mean, "low": mean - half_width, "high": mean + half_width, "std": std, "n": n}
+
+
+def bootstrap_mean_interval(values: np.ndarray, n_resamples: int = 2000, level: float = 0.95, seed: int = 0,
+                            chunk_elements: int = 1 << 22) -> Dict[str, float]:
+    """
+    Percentile bootstrap confidence interval of the mean.
+
+    Resamples are drawn as index matrices, in chunks of about `chunk_elements` draws so
+    that thousands of runs do not need a resamples × runs matrix at once.
+
+    Args:
+    values (np.ndarray): One value per run; NaN values are dropped.
+    n_resamples (int): Number of bootstrap resamples.
+    level (float): Confidence level of the interval.
+    seed (int): Seed of the resampling generator.
+
+    Returns:
+    Dict[str, float]: The interval bounds "low" and "high" (NaN without data).
+    """
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"low": float("nan"), "high": float("nan")}
+    rng = np.random.default_rng(seed)
+    means = np.empty(n_resamples)
+    chunk = max(1, chunk_elements // len(values))
+    for start in range(0, n_resamples, chunk):
+        size = min(chunk, n_resamples - start)
+        means[start:start + size] = values[rng.integers(0, len(values), (size, len(values)))].mean(axis=1)
+    low, high = np.percentile(means, [50 * (1 - level), 50 * (1 + level)])
+    return {"low": float(low), "high": float(high)}
+
+
+def autocorrelation(x: np.ndarray, max_lag: int = 50) -> np.ndarray:
+    """
+    Autocorrelation function of every run, computed with one batched FFT.
+
+    Padding after the end of a shorter run is masked out and each lag is normalized by
+    the number of pairs that actually exist at that lag.
+
+    Args:
+    x (np.ndarray): (runs, turns) series.
+    max_lag (int): Largest lag to return.
+
+    Returns:
+    np.ndarray: (runs, max_lag + 1) autocorrelations; NaN for constant runs.
+    """
+    runs, turns = x.shape
+    max_lag = min(max_lag, max(turns - 1, 0))
+    mask = ~np.isnan(x)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(x, axis=1, keepdims=True) / mask.sum(axis=1, keepdims=True)
+    centered = np.where(mask, x - mean, 0.0)
+    size = 1 << int(2 * turns - 1).bit_length()
+    spectrum = np.fft.rfft(centered, size, axis=1)
+    covariance = np.fft.irfft(spectrum * np.conj(spectrum), size, axis=1)[:, :max_lag + 1]
+    mask_spectrum = np.fft.rfft(mask.astype(float), size, axis=1)
+    pairs = np.rint(np.fft.irfft(mask_spectrum * np.conj(mask_spectrum), size, axis=1)[:, :max_lag + 1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = covariance / np.maximum(pairs, 1)
+        return covariance / covariance[:, :1]
+
+
+def decorrelation_lag(acf: np.ndarray, threshold: float = float(np.exp(-1))) -> np.ndarray:
+    """Return the first lag at which each run's autocorrelation drops below `threshold` (NaN if it never does)."""
+    below = acf < threshold
+    return np.where(below.any(axis=1), np.argmax(below, axis=1), np.nan)
+
+
+def convergence_turn(x: np.ndarray, lengths: np.ndarray, tolerance: float = 0.05) -> np.ndarray:
+    """
+    Return the turn from which each run stays within `tolerance` of its final value.
+
+    Args:
+    x (np.ndarray): (runs, turns) series.
+    lengths (np.ndarray): Number of turns of each run.
+    tolerance (float): Allowed absolute deviation from the final value.
+
+    Returns:
+    np.ndarray: 1-based convergence turn of each run.
+    """
+    deviates = np.abs(x - final_values(x, lengths)[:, None]) > tolerance
+    last_deviation = x.shape[1] - 1 - np.argmax(deviates[:, ::-1], axis=1)
+    return np.where(deviates.any(axis=1), last_deviation + 2, 1)
+
+
+def pearson_per_run(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson correlation of two (runs, turns) series within each run, over the turns both have; NaN for constant runs."""
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    n = mask.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(mask, x - np.where(mask, x, 0).sum(axis=1, keepdims=True) / n, 0.0)
+        dy = np.where(mask, y - np.where(mask, y, 0).sum(axis=1, keepdims=True) / n, 0.0)
+        return (dx * dy).sum(axis=1) / np.sqrt((dx ** 2).sum(axis=1) * (dy ** 2).sum(axis=1))
+
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    return float(pearson_per_run(x.reshape(1, -1), y.reshape(1, -1))[0])
+
+
+def _number(value) -> Any:
+    """JSON-friendly float: NaN becomes None."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 6)
+
+
+def _summary(values: np.ndarray) -> Dict[str, Any]:
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"median": None, "mean": None, "p90": None}
+    median, p90 = np.percentile(values, [50, 90])
+    return {"median": _number(median), "mean": _number(values.mean()), "p90": _number(p90)}
+
+
+def analyze_runs(runs: RunSet, level: float = 0.95, n_resamples: int = 2000, tolerance: float = 0.05,
+                 max_lag: int = 50, seed: int = 0) -> Dict[str, Any]:
+    """
+    Aggregate one group of runs.
+
+    Args:
+    runs (RunSet): The runs to aggregate, e.g. all seeds of one configuration.
+    level (float): Confidence level of the intervals.
+    n_resamples (int): Bootstrap resamples for the interval of the final values.
+    tolerance (float): Leaning deviation allowed when detecting the convergence turn.
+    max_lag (int): Largest autocorrelation lag considered.
+    seed (int): Seed of the bootstrap.
+
+    Returns:
+    Dict[str, Any]: Final-value statistics per series, convergence, autocorrelation,
+    metric–leaning correlations and the per-turn leaning band.
+    """
+    leaning = runs.get("political_leaning")
+    report = {
+        "runs": len(runs.paths),
+        "turns": {"min": int(runs.lengths.min()), "max": int(runs.lengths.max())},
+        "final": {},
+    }
+    finals = {name: final_values(runs.get(name), runs.lengths) for name in SERIES_NAMES}
+    for name in SERIES_NAMES:
+        interval = mean_confidence_interval(finals[name], level)
+        bootstrap = bootstrap_mean_interval(finals[name], n_resamples, level, seed)
+        report["final"][name] = {
+            "mean": _number(interval["mean"]),
+            "std": _number(interval["std"]),
+            "ci_low": _number(interval["low"]),
+            "ci_high": _number(interval["high"]),
+            "bootstrap_low": _number(bootstrap["low"]),
+            "bootstrap_high": _number(bootstrap["high"]),
+        }
+
+    acf = autocorrelation(leaning, max_lag)
+    mean_acf = mean_confidence_interval(acf, level)["mean"]
+    report["convergence_turn"] = _summary(convergence_turn(leaning, runs.lengths, tolerance).astype(float))
+    report["autocorrelation"] = {
+        "decorrelation_lag": _summary(decorrelation_lag(acf)),
+        "mean_acf": {str(lag): _number(mean_acf[lag]) for lag in (1, 5, 10, 25, 50) if lag < len(mean_acf)},
+    }
+
+    report["correlations"] = {}
+    valid = ~np.isnan(leaning)
+    for name in METRIC_NAMES:
+        metric = runs.get(name)
+        both = valid & ~np.isnan(metric)
+        report["correlations"][name] = {
+            "within_run_mean": _summary(pearson_per_run(leaning, metric))["mean"],
+            "pooled": _number(_pearson(leaning[both], metric[both])),
+            "across_run_final": _number(_pearson(finals["political_leaning"], finals[name])),
+        }
+
+    band = mean_confidence_interval(leaning, level)
+    report["per_turn_leaning"] = {key: [_number(value) for value in band[key]] for key in ("mean", "low", "high")}
+    return report
+
+
+def analyze(runs: RunSet, **options) -> Dict[str, Any]:
+    """
+    Aggregate all runs together and per configuration.
+
+    Args:
+    runs (RunSet): The loaded runs.
+    **options: Passed on to `analyze_runs()`.
+
+    Returns:
+    Dict[str, Any]: {"all": report, "configurations": {label: report}}.
+    """
+    labels = np.array(runs.labels)
+    return {
+        "all": analyze_runs(runs, **options),
+        "configurations": {
+            label: analyze_runs(runs.subset(np.flatnonzero(labels == label)), **options)
+            for label in sorted(set(runs.labels))
+        },
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render an `analyze()` result as plain text, without the per-turn bands."""
+    def fmt(value):
+        return "n/a" if value is None else f"{value:.3f}"
+
+    lines = []
+    for title, group in [("All runs", report["all"])] + list(report["configurations"].items()):
+        lines.append(f"== {title}: {group['runs']} runs, {group['turns']['min']}-{group['turns']['max']} turns ==")
+        lines.append(f"{'Final value':<24} {'Mean':>8} {'Std':>8} {'CI low':>8} {'CI high':>8} {'Boot low':>9} {'Boot high':>9}")
+        for name, stats in group["final"].items():
+            lines.append(
+                f"{name:<24} {fmt(stats['mean']):>8} {fmt(stats['std']):>8} {fmt(stats['ci_low']):>8} "
+                f"{fmt(stats['ci_high']):>8} {fmt(stats['bootstrap_low']):>9} {fmt(stats['bootstrap_high']):>9}"
+            )
+        convergence = group["convergence_turn"]
+        lines.append(f"Leaning convergence turn: median {fmt(convergence['median'])}, mean {fmt(convergence['mean'])}, p90 {fmt(convergence['p90'])}")
+        decorrelation = group["autocorrelation"]["decorrelation_lag"]
+        acf = ", ".join(f"lag {lag}: {fmt(value)}" for lag, value in group["autocorrelation"]["mean_acf"].items())
+        lines.append(f"Leaning decorrelation lag: median {fmt(decorrelation['median'])} (mean ACF {acf})")
+        lines.append(f"{'Correlation with leaning':<24} {'Within':>8} {'Pooled':>8} {'Finals':>8}")
+        for name, stats in group["correlations"].items():
+            lines.append(f"{name:<24} {fmt(stats['within_run_mean']):>8} {fmt(stats['pooled']):>8} {fmt(stats['across_run_final']):>8}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_report(paths: Sequence[str], output_prefix: str, **options) -> Dict[str, Any]:
+    """
+    Load runs, analyze them and write `<output_prefix>.txt` and `<output_prefix>.json`.
+
+    Args:
+    paths (Sequence[str]): Journal files or directories containing them.
+    output_prefix (str): Path of the report files without extension.
+    **options: Passed on to `analyze_runs()`.
+
+    Returns:
+    Dict[str, Any]: The report, or an empty dict if no journal was found.
+    """
+    runs = load_runs(paths)
+    if not runs.paths:
+        return {}
+    report = analyze(runs, **options)
+    with open(f"{output_prefix}.txt", "w", encoding="utf-8") as f:
+        f.write(format_report(report))
+    with open(f"{output_prefix}.json", "w", encoding="utf-8") as f:
+        json.dump(dict(report, journals=runs.paths), f)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate the journals of many runs into one statistical report.")
+    parser.add_argument("paths", nargs="+", help="Journal files or directories (searched recursively).")
+    parser.add_argument("--output", default="analysis_report", help="Report path without extension.")
+    parser.add_argument("--level", type=float, default=0.95, help="Confidence level of the intervals.")
+    parser.add_argument("--bootstrap", type=int, default=2000, help="Number of bootstrap resamples.")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Leaning tolerance for the convergence turn.")
+    parser.add_argument("--max-lag", type=int, default=50, help="Largest autocorrelation lag.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the bootstrap.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = write_report(args.paths, args.output, level=args.level, n_resamples=args.bootstrap,
+                          tolerance=args.tolerance, max_lag=args.max_lag, seed=args.seed)
+    if not report:
+        print("No run journals found.")
+        return 1
+    print(format_report(report))
+    print(f"Report written to {args.output}.txt and {args.output}.json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class RunJournal:
+    """
+    Append-only JSON Lines journal of a simulation run.
+
+    Every turn is written as one compact JSON object as soon as it is known, through a
+    buffered file that is flushed every `flush_every` records. A crash therefore loses at
+    most the last few turns instead of the whole run, and reports can be rebuilt from the
+    file at any time.
+    """
+
+    def __init__(self, path: str, flush_every: int = 10, append: bool = False, buffer_size: int = 64 * 1024):
+        """
+        Args:
+        path (str): Location of the journal file.
+        flush_every (int): Number of records written between flushes.
+        append (bool): Continue an existing journal instead of starting a new one.
+        buffer_size (int): Size of the write buffer in bytes.
+        """
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._unflushed = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if append else "w", encoding="utf-8", buffering=buffer_size)
+        # Logical size of the journal including buffered records, used as a checkpoint offset
+        self.bytes_written = os.path.getsize(path) if append else 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Write one record, flushing the buffer every `flush_every` records."""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self.bytes_written += len(line.encode("utf-8"))
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+
+    def flush(self) -> None:
+        """Push buffered records to the file."""
+        with self._lock:
+            self._file.flush()
+            self._unflushed = 0
+
+    def close(self) -> None:
+        """Flush and close the journal. Further appends are not allowed."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of a journal file in the order they were written.
+
+    A final line cut short by a crash is ignored.
+
+    Args:
+    path (str): Location of the journal file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_journal(path: str) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Read a journal file.
+
+    Args:
+    path (str): Location of the journal file.
+
+    Returns:
+    Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]: The per-turn records in turn order,
+    and the final record of the run (None if the run did not finish).
+    """
+    turns = []
+    final = None
+    for record in iter_journal(path):
+        event = record.get("event", "turn")
+        if event == "turn":
+            turns.append(record)
+        elif event == "final":
+            final = record
+    turns.sort(key=lambda record: record["turn"])
+    return turns, final
+
+
+def leaning_series(path: str) -> List[float]:
+    """Return the political leaning recorded for each evaluated turn, in turn order."""
+    turns, _ = load_journal(path)
+    return [record["political_leaning"] for record in turns if record.get("political_leaning") is not None]
@@ -0,0 +1,205 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional
+
+# Parent of every logger of the simulation; subsystems log to "politics.<subsystem>"
+ROOT_LOGGER = "politics"
+SUBSYSTEMS = ("run", "swarm", "evaluator", "summarizer", "requests")
+
+FILE_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(threadName)s] %(message)s"
+CONSOLE_FORMAT = "%(message)s"
+
+# Run whose records are being logged from the current thread/task; None outside a run
+_active_run = ContextVar("active_log_run", default=None)
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Return the logger of a subsystem, e.g. `get_logger("evaluator")`."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+class _RunTagFilter(logging.Filter):
+    """Stamps each record with the run it was logged from, before it leaves the logging thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        run = _active_run.get()
+        record.run_id = run.run_id if run is not None else None
+        record.run_console = run.console if run is not None else True
+        return True
+
+
+class _RunFilter(logging.Filter):
+    """Passes only the records of one run."""
+
+    def __init__(self, run_id: int):
+        super().__init__()
+        self.run_id = run_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "run_id", None) == self.run_id
+
+
+class _ConsoleFilter(logging.Filter):
+    """Drops the records of runs that asked not to log to the console."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "run_console", True)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever `sys.stdout` is when the record is emitted, so redirections are honoured."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _HandlerSet(logging.Handler):
+    """Forwards records to a set of handlers that can change while the queue listener runs."""
+
+    def __init__(self):
+        super().__init__()
+        self._handlers: List[logging.Handler] = []
+        self._handlers_lock = threading.Lock()
+
+    def add(self, handler: logging.Handler) -> None:
+        with self._handlers_lock:
+            self._handlers = self._handlers + [handler]
+
+    def remove(self, handler: logging.Handler) -> None:
+        with self._handlers_lock:
+            self._handlers = [other for other in self._handlers if other is not handler]
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in self._handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class RunLog:
+    """The file (and console) destination of one run's records."""
+
+    _ids = iter(range(1, sys.maxsize))
+
+    def __init__(self, path: Optional[str], console: bool):
+        self.run_id = next(RunLog._ids)
+        self.path = path
+        self.console = console
+        self.handler: Optional[logging.Handler] = None
+
+
+_lock = threading.Lock()
+_queue: Optional[queue.Queue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_handlers: Optional[_HandlerSet] = None
+_console: Optional[logging.Handler] = None
+
+
+def setup_logging(level: str = "INFO", subsystem_levels: Optional[Dict[str, str]] = None,
+                  console_level: str = "INFO") -> None:
+    """
+    Route the simulation's log records through a queue to a background writer thread.
+
+    Logging calls only put the record on an in-memory queue; formatting and all file and
+    terminal I/O happen on the listener thread, off the turn loop. Calling this again only
+    updates the levels.
+
+    Args:
+    level (str): Level of the "politics" logger, used by subsystems without their own level.
+    subsystem_levels (Dict[str, str]): Levels of individual subsystems, e.g. {"swarm": "DEBUG"}.
+    console_level (str): Lowest level written to the console.
+    """
+    global _queue, _listener, _handlers, _console
+    with _lock:
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(level.upper())
+        for subsystem, subsystem_level in (subsystem_levels or {}).items():
+            get_logger(subsystem).setLevel(subsystem_level.upper() if subsystem_level else logging.NOTSET)
+        if _listener is None:
+            _queue = queue.Queue()
+            queue_handler = logging.handlers.QueueHandler(_queue)
+            queue_handler.addFilter(_RunTagFilter())
+            root.addHandler(queue_handler)
+            root.propagate = False
+            _handlers = _HandlerSet()
+            _console = _StdoutHandler()
+            _console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            _console.addFilter(_ConsoleFilter())
+            _handlers.add(_console)
+            _listener = logging.handlers.QueueListener(_queue, _handlers)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        _console.setLevel(console_level.upper())
+
+
+def is_logging_configured() -> bool:
+    """Return True once `setup_logging()` has started the queue listener."""
+    return _listener is not None
+
+
+def enable_debug(subsystems: Iterable[str]) -> None:
+    """Turn on debug output for the given subsystems (all of them if empty)."""
+    for subsystem in list(subsystems) or SUBSYSTEMS:
+        get_logger(subsystem).setLevel(logging.DEBUG)
+
+
+@contextmanager
+def run_log(path: Optional[str], console: bool = True, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+    """
+    Send the records logged by the current run to its own rotating log file.
+
+    Records are attributed to the run through a context variable, so concurrent runs in
+    one process each get their own file.
+
+    Args:
+    path (str): The run's log file, or None for no file.
+    console (bool): Also show the run's records on the console.
+    max_bytes (int): Size at which the file is rotated.
+    backup_count (int): Rotated files kept next to the current one.
+    """
+    if _listener is None:
+        setup_logging()
+    run = RunLog(path, console)
+    if path:
+        run.handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                           encoding="utf-8", delay=True)
+        run.handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        run.handler.addFilter(_RunFilter(run.run_id))
+        _handlers.add(run.handler)
+    token = _active_run.set(run)
+    try:
+        yield run
+    finally:
+        _active_run.reset(token)
+        if run.handler is not None:
+            flush_logging()
+            _handlers.remove(run.handler)
+            run.handler.close()
+
+
+def flush_logging() -> None:
+    """Wait until every record logged so far has been written."""
+    if _queue is not None and _listener is not None:
+        _queue.join()
+
+
+def shutdown_logging() -> None:
+    """Write out the remaining records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
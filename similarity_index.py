@@ -0,0 +1,167 @@
+import hashlib
+import random
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Modulus of the hash permutations (a Mersenne prime); shingle hashes are reduced below it
+_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """
+    Return the word `size`-grams of a text, case- and punctuation-insensitive.
+
+    Texts shorter than `size` words are a single shingle, so they still match their exact repeats.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") % _PRIME
+
+
+@dataclass
+class SimilarMatch:
+    """An earlier text found to be a near-duplicate of the query."""
+    key: Any
+    similarity: float
+    payload: Any
+
+
+class MinHashIndex:
+    """
+    Offline near-duplicate index of texts, using MinHash signatures of word shingles.
+
+    The similarity of two texts is the Jaccard similarity of their shingle sets, estimated
+    from how many of the `num_perm` signature values agree. Candidates are found with
+    locality-sensitive hashing: the signature is cut into `bands` bands, and only texts
+    sharing at least one whole band with the query are compared, so a lookup does not scan
+    the index. At most `max_items` texts are kept (oldest evicted first), so memory stays
+    bounded on long runs. Safe to use from several threads.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 16, max_items: int = 1000,
+                 shingle_size: int = 3, seed: int = 1):
+        """
+        Args:
+        threshold (float): Lowest estimated similarity reported as a near-duplicate.
+        num_perm (int): Length of the MinHash signatures; must be a multiple of `bands`.
+        bands (int): LSH bands; more bands find candidates of lower similarity.
+        max_items (int): Texts kept in the index.
+        shingle_size (int): Words per shingle.
+        seed (int): Seed of the hash permutations; indices are only comparable with the same seed.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_items = max_items
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        # key -> (signature, payload), oldest first
+        self._items: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._buckets: Dict[tuple, List[Any]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def signature(self, text: str) -> Optional[List[int]]:
+        """Return the MinHash signature of a text, or None if it has no words."""
+        hashes = [_hash(shingle) for shingle in shingles(text, self.shingle_size)]
+        if not hashes:
+            return None
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._permutations]
+
+    def _band_keys(self, signature: List[int]) -> List[tuple]:
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def _query(self, signature: List[int]) -> Optional[SimilarMatch]:
+        best = None
+        seen = set()
+        for band_key in self._band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                other, payload = self._items[key]
+                similarity = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = SimilarMatch(key, similarity, payload)
+        return best
+
+    def query(self, text: str) -> Optional[SimilarMatch]:
+        """Return the most similar indexed text at or above the threshold, or None."""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            match = self._query(signature)
+            if match is not None:
+                self.hits += 1
+            return match
+
+    def add(self, key: Any, text: str, payload: Any = None) -> None:
+        """Index a text under `key` (replacing an earlier text with the same key) with a payload returned by matches."""
+        signature = self.signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            self._insert(key, signature, payload)
+
+    def query_and_add(self, key: Any, text: str, payload: Any = None) -> Optional[SimilarMatch]:
+        """Look a text up among the earlier ones, then index it; computes the signature once."""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            match = self._query(signature)
+            if match is not None:
+                self.hits += 1
+            self._insert(key, signature, payload)
+            return match
+
+    def _insert(self, key: Any, signature: List[int], payload: Any) -> None:
+        if key in self._items:
+            self._remove(key)
+        self._items[key] = (signature, payload)
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(key)
+        while len(self._items) > self.max_items:
+            self._remove(next(iter(self._items)))
+
+    def _remove(self, key: Any) -> None:
+        signature, _ = self._items.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets[band_key]
+            bucket.remove(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Return the index contents for a checkpoint; keys and payloads must be JSON-serializable."""
+        with self._lock:
+            return {
+                "items": [[key, signature, payload] for key, (signature, payload) in self._items.items()],
+                "hits": self.hits
+            }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore the index contents saved by `state_dict()` (with the same settings and seed)."""
+        with self._lock:
+            self._items.clear()
+            self._buckets.clear()
+            for key, signature, payload in state["items"]:
+                self._insert(key, signature, payload)
+            self.hits = state["hits"]
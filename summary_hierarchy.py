@@ -0,0 +1,144 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+class SummaryHierarchy:
+    """
+    Rolling multi-level summaries of a conversation in constant memory.
+
+    Level 0 holds the last `fanout` turn messages; level k holds the last `fanout` summaries
+    covering `fanout ** k` turns each (10-turn, 100-turn, 1000-turn, ... for a fanout of 10).
+    Whenever a turn completes a window of level k, the window's items from level k - 1 are
+    summarized into one new level-k item, and new levels are added as the run grows (up to
+    `max_depth`). Each level is a bounded deque, so memory does not grow with the run length.
+
+    Level 0 is written by the turn loop while the summaries may be built on a worker thread:
+    `take_window()` copies the messages of a completed window on the loop's thread and
+    `promote()` builds the summaries from that copy.
+    """
+
+    def __init__(self, summarize: Callable[[str, str, int], str], fanout: int = 10, max_depth: Optional[int] = None):
+        """
+        Args:
+        summarize (Callable[[str, str, int], str]): Called as `summarize(content, summary_type, turn)`
+            to produce one summary.
+        fanout (int): Items of one level that make up one item of the level above.
+        max_depth (int): Highest summary level. Defaults to no limit.
+        """
+        self.summarize = summarize
+        self.fanout = fanout
+        self.max_depth = max_depth
+        self._levels: List[deque] = [deque(maxlen=fanout)]
+        # Items at the end of each level not yet covered by a summary of the level above
+        self._uncovered: List[int] = [0]
+        self._lock = threading.RLock()
+
+    @property
+    def depth(self) -> int:
+        """Number of summary levels that exist so far."""
+        with self._lock:
+            return len(self._levels) - 1
+
+    def summary_type(self, level: int) -> str:
+        """Return the name of a summary level, e.g. "100-turn"."""
+        return f"{self.fanout ** level}-turn"
+
+    def is_due(self, turn: int) -> bool:
+        """Return True if `turn` completes a window of level 1, so summaries should be built."""
+        return turn % self.fanout == 0
+
+    def add(self, message: str) -> None:
+        """Record the message of the latest turn."""
+        with self._lock:
+            self._levels[0].append(message)
+            self._uncovered[0] = min(self._uncovered[0] + 1, self.fanout)
+
+    def take_window(self) -> List[str]:
+        """Return the messages of the window that just completed and mark them as summarized."""
+        with self._lock:
+            self._uncovered[0] = 0
+            return list(self._levels[0])
+
+    def _push(self, level: int, summary: str) -> None:
+        with self._lock:
+            if level == len(self._levels):
+                self._levels.append(deque(maxlen=self.fanout))
+                self._uncovered.append(0)
+            self._levels[level].append(summary)
+            self._uncovered[level] = min(self._uncovered[level] + 1, self.fanout)
+
+    def promote(self, turn: int, window: List[str]) -> None:
+        """
+        Summarize a completed window of messages and every higher level it completes.
+
+        Args:
+        turn (int): The turn that completed the window.
+        window (List[str]): The window's messages, from `take_window()`.
+        """
+        items = window
+        level = 1
+        while True:
+            self._push(level, self.summarize("\n".join(items), self.summary_type(level), turn))
+            if self.max_depth is not None and level >= self.max_depth:
+                return
+            if turn % self.fanout ** (level + 1) != 0:
+                return
+            with self._lock:
+                items = list(self._levels[level])
+                self._uncovered[level] = 0
+            level += 1
+
+    def uncovered(self, level: int) -> List[str]:
+        """
+        Return the items of a level that no summary of the level above covers yet.
+
+        Every item of the top level is uncovered.
+        """
+        with self._lock:
+            items = self._levels[level]
+            if level == len(self._levels) - 1:
+                return list(items)
+            count = self._uncovered[level]
+            return list(items)[len(items) - count:] if count else []
+
+    def context_note(self, per_level: int = 3) -> str:
+        """
+        Return the text that stands in for evicted conversation history.
+
+        Combines, from the highest level down, the latest summaries of each level that are not
+        yet covered by a summary of the level above.
+
+        Args:
+        per_level (int): Most summaries taken from one level.
+        """
+        with self._lock:
+            parts = []
+            for level in range(len(self._levels) - 1, 0, -1):
+                parts.extend(summary for summary in self.uncovered(level)[-per_level:] if summary)
+            return "\n\n".join(parts)
+
+    def final_content(self) -> str:
+        """
+        Return everything the hierarchy knows about the run, for the final summary.
+
+        The summaries of each level are followed by the newer items of the level below that
+        they do not cover, down to the messages of the last, incomplete window. This is
+        correct for runs of any length, including runs stopped early.
+        """
+        with self._lock:
+            parts = []
+            for level in range(len(self._levels) - 1, -1, -1):
+                parts.extend(item for item in self.uncovered(level) if item)
+            return "\n".join(parts)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Return the hierarchy state for a checkpoint."""
+        with self._lock:
+            return {"levels": [list(level) for level in self._levels], "uncovered": list(self._uncovered)}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Restore the hierarchy state saved by `state_dict()`."""
+        with self._lock:
+            self._levels = [deque(level, maxlen=self.fanout) for level in state["levels"]]
+            self._uncovered = list(state["uncovered"])
@@ -0,0 +1,55 @@
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LLM_BACKEND", "mock")
+
+import optimal_politics_swarm as politics_swarm
+from deliberation_round import SYNTHESIS_PROMPT, DeliberationRound
+from mock_llm import MockLLMClient
+from routed_swarm import RoutedSwarm
+
+
+class RecordingClient:
+    """Mock client that keeps every request it receives, with the content of its reply."""
+
+    def __init__(self, client):
+        self.requests = []
+        self._lock = threading.Lock()
+        self._client = client
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        completion = self._client.chat.completions.create(**request)
+        with self._lock:
+            self.requests.append((request, completion.choices[0].message.content))
+        return completion
+
+
+def test_synthesis_names_every_specialist_next_to_its_answer():
+    # Jitter makes the specialists finish in a random order
+    client = RecordingClient(MockLLMClient(seed=3, jitter=0.02))
+    agents = politics_swarm.get_agents()
+    specialists = politics_swarm.round_specialists(agents)
+    deliberation_round = DeliberationRound(RoutedSwarm(client=client), agents["Director"], specialists)
+    try:
+        deliberation_round.run([{"role": "user", "content": "Develop a political framework."}], {"political_leaning": 0.0})
+    finally:
+        deliberation_round.shutdown()
+
+    synthesis = [request for request, _ in client.requests if request["messages"][-1]["content"] == SYNTHESIS_PROMPT]
+    assert len(synthesis) == 1
+    answers = [message["content"] for message in synthesis[0]["messages"][3:-1]]
+
+    # One answer per specialist, in roster order, each starting with its speaker's name
+    assert len(answers) == len(specialists)
+    for agent, answer in zip(specialists, answers):
+        reply = next(reply for request, reply in client.requests if request["messages"][0]["content"] == agent.instructions)
+        assert answer == f"{agent.name}: {reply}"
+
+
+if __name__ == "__main__":
+    test_synthesis_names_every_specialist_next_to_its_answer()
+    print("ok")
@@ -0,0 +1,142 @@
+import json
+import os
+import re
+import sys
+import tempfile
+from contextlib import ExitStack
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LLM_BACKEND", "mock")
+
+import optimal_politics_swarm as politics_swarm
+from mock_llm import MockLLMClient
+from optimal_politics_swarm import RunConfig
+from routed_swarm import RoutedSwarm
+from run_journal import load_journal
+
+FAILED = "Error: Failed to parse evaluation results."
+METRICS = {"economy": 0.6, "fairness": 0.6, "equality": 0.6, "technological_progress": 0.6}
+BATCH_TURN = re.compile(r"^### Turn (\d+)$", re.MULTILINE)
+
+
+def run_turns(turns, proposals=lambda call: "Expand public transit.", pipelined=False, **settings):
+    """
+    Run a mock simulation in which the agents only talk and the proposals come from `proposals(call)`.
+
+    Returns:
+    list: The run's journaled turn records.
+    """
+    original_run = RoutedSwarm.run
+    calls = []
+
+    def run(self, *args, **kwargs):
+        response = original_run(self, *args, **kwargs)
+        response.context_variables["current_proposals"] = proposals(len(calls))
+        calls.append(1)
+        return response
+
+    with tempfile.TemporaryDirectory(prefix="politics_test_") as output_dir, ExitStack() as stack:
+        stack.enter_context(mock.patch.object(politics_swarm, "_client", MockLLMClient(tool_call_rate=0.0)))
+        stack.enter_context(mock.patch.object(politics_swarm, "RESPONSE_CACHE_ENABLED", False))
+        stack.enter_context(mock.patch.object(RoutedSwarm, "run", run))
+        for name, value in settings.items():
+            stack.enter_context(mock.patch.object(politics_swarm, name, value))
+        config = RunConfig(max_turns=turns, output_dir=output_dir, pipelined=pipelined)
+        politics_swarm.main(config, console_log=False)
+        turn_records, _ = load_journal(config.journal_path)
+    return turn_records
+
+
+def fail_first_evaluation():
+    """Return a stand-in for `evaluate_framework` that fails once and then succeeds, and its call log."""
+    calls = []
+
+    def evaluate_framework(proposals, decisions, current_leaning, context_variables=None):
+        calls.append(proposals)
+        if len(calls) == 1:
+            return FAILED
+        context_variables["metrics"] = dict(METRICS)
+        return f"Framework evaluated. New metrics: {METRICS}, New leaning: {current_leaning}"
+
+    return evaluate_framework, calls
+
+
+def test_failed_evaluation_is_retried_on_the_next_turn():
+    evaluate_framework, calls = fail_first_evaluation()
+    with mock.patch.object(politics_swarm, "evaluate_framework", evaluate_framework):
+        run_turns(10)
+    # The failure is retried once, and the successful evaluation is then reused
+    assert len(calls) == 2
+
+
+def test_failed_pipelined_evaluation_is_retried():
+    evaluate_framework, calls = fail_first_evaluation()
+    with mock.patch.object(politics_swarm, "evaluate_framework", evaluate_framework):
+        turn_records = run_turns(10, pipelined=True)
+    assert len(calls) == 2
+    assert turn_records[-1]["metrics"] == METRICS
+
+
+def batch_evaluator(first_reply):
+    """
+    Return a stand-in for `request_evaluation` and the turns of each batch it is asked to score.
+
+    The first batch is answered by `first_reply(turns)`, every later one with a score for each turn.
+    """
+    batches = []
+
+    def request_evaluation(messages, **kwargs):
+        turns = [int(turn) for turn in BATCH_TURN.findall(messages[-1]["content"])]
+        batches.append(turns)
+        if len(batches) == 1:
+            return first_reply(turns)
+        return json.dumps({"evaluations": [{"turn": turn, "metrics": METRICS, "political_leaning": 0.1} for turn in turns]})
+
+    return request_evaluation, batches
+
+
+def test_failed_batch_is_scored_again():
+    def fail(turns):
+        raise RuntimeError("batch request failed")
+
+    request_evaluation, batches = batch_evaluator(fail)
+    with mock.patch.object(politics_swarm, "request_evaluation", request_evaluation):
+        turn_records = run_turns(6, EVALUATION_BATCH_SIZE=3, CHECKPOINT_EVERY=3)
+    # Turns 2 and 3 reuse turn 1's pending state and the checkpoint after turn 3 flushes the
+    # batch; after the failure, turn 4 scores the state again
+    assert batches == [[1], [4]]
+    assert turn_records[0].get("evaluation_failed")
+    assert turn_records[-1]["metrics"] == METRICS
+
+
+def test_turns_left_out_of_a_batch_reply_are_scored_again():
+    def only_first_turn(turns):
+        return json.dumps({"evaluations": [{"turn": turns[0], "metrics": METRICS, "political_leaning": 0.1}]})
+
+    request_evaluation, batches = batch_evaluator(only_first_turn)
+    with mock.patch.object(politics_swarm, "request_evaluation", request_evaluation):
+        turn_records = run_turns(6, proposals=lambda call: "Plan A" if call == 0 else "Plan B",
+                                 EVALUATION_BATCH_SIZE=3, CHECKPOINT_EVERY=3)
+    # The reply leaves out turn 2, whose state ("Plan B") is scored again on turn 4
+    assert batches == [[1, 2], [4]]
+    assert [record.get("evaluation_failed", False) for record in turn_records[:2]] == [False, True]
+
+
+def test_batched_pipelined_failures_are_scored_again():
+    def fail(turns):
+        raise RuntimeError("batch request failed")
+
+    request_evaluation, batches = batch_evaluator(fail)
+    with mock.patch.object(politics_swarm, "request_evaluation", request_evaluation):
+        run_turns(6, pipelined=True, EVALUATION_BATCH_SIZE=3, CHECKPOINT_EVERY=3)
+    assert batches[0] == [1] and len(batches) == 2
+
+
+if __name__ == "__main__":
+    test_failed_evaluation_is_retried_on_the_next_turn()
+    test_failed_pipelined_evaluation_is_retried()
+    test_failed_batch_is_scored_again()
+    test_turns_left_out_of_a_batch_reply_are_scored_again()
+    test_batched_pipelined_failures_are_scored_again()
+    print("ok")
@@ -0,0 +1,100 @@
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Tuple
+
+
+class TurnPipeline:
+    """
+    Runs framework evaluations and periodic summaries off the turn loop.
+
+    Evaluations go to a pool of `evaluation_workers` threads and may finish in any order,
+    but `collect()` hands their results back strictly in turn order. Summaries go to a
+    single worker so each level (10/100/1000-turn) always sees the summaries it is built
+    from. Tasks run in a copy of the submitting context, so the active run's settings
+    follow them onto the worker threads.
+    """
+
+    def __init__(self, evaluation_workers: int = 2, max_pending: int = None):
+        """
+        Args:
+        evaluation_workers (int): Number of evaluations that may run at once.
+        max_pending (int): Turns allowed to wait for their evaluation before the loop blocks
+            on the oldest one. Defaults to twice the number of workers.
+        """
+        self.max_pending = max_pending or 2 * evaluation_workers
+        self._evaluations = ThreadPoolExecutor(max_workers=evaluation_workers, thread_name_prefix="evaluator")
+        self._summaries = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+        # (turn, future or None); None marks a turn that reused the previous evaluation
+        self._pending = deque()
+        self._summary_futures = deque()
+
+    def submit_evaluation(self, turn: int, fn: Callable, *args, **kwargs) -> None:
+        """Schedule the evaluation for `turn`; its return value is delivered by `collect()`."""
+        context = contextvars.copy_context()
+        self._pending.append((turn, self._evaluations.submit(context.run, fn, *args, **kwargs)))
+
+    def record_skip(self, turn: int) -> None:
+        """Keep `turn`'s slot in the ordered results for a turn that did not need an evaluation."""
+        self._pending.append((turn, None))
+
+    def submit_summaries(self, fn: Callable, *args, **kwargs) -> None:
+        """Schedule a summarization task behind every previously submitted one."""
+        context = contextvars.copy_context()
+        self._summary_futures.append(self._summaries.submit(context.run, fn, *args, **kwargs))
+        while self._summary_futures and self._summary_futures[0].done():
+            self._summary_futures.popleft().result()
+
+    @property
+    def pending(self) -> int:
+        """Number of turns whose results have not been collected yet."""
+        return len(self._pending)
+
+    def collect(self, block: bool = False) -> List[Tuple[int, Any]]:
+        """
+        Return finished results in turn order as (turn, result) pairs.
+
+        Stops at the first evaluation still running unless `block` is True. A result of None
+        means the turn was recorded with `record_skip()`. Exceptions raised by an evaluation
+        are re-raised here.
+
+        Args:
+        block (bool): Wait for every pending evaluation instead of only the finished ones.
+
+        Returns:
+        List[Tuple[int, Any]]: The collected (turn, result) pairs, oldest first.
+        """
+        results = []
+        while self._pending:
+            turn, future = self._pending[0]
+            # Apply backpressure once too many turns are waiting on the evaluator
+            must_wait = block or len(self._pending) > self.max_pending
+            if future is not None and not future.done() and not must_wait:
+                break
+            self._pending.popleft()
+            results.append((turn, future.result() if future is not None else None))
+        return results
+
+    def drain(self) -> List[Tuple[int, Any]]:
+        """Wait for all submitted work and return the remaining evaluation results in turn order."""
+        results = self.collect(block=True)
+        wait(list(self._summary_futures))
+        while self._summary_futures:
+            self._summary_futures.popleft().result()
+        return results
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """
+        Stop the worker threads, waiting for anything still running.
+
+        Args:
+        cancel (bool): Drop the work that has not started yet instead of running it first.
+        """
+        if cancel:
+            for _, future in self._pending:
+                if future is not None:
+                    future.cancel()
+            for future in self._summary_futures:
+                future.cancel()
+        self._evaluations.shutdown(wait=True)
+        self._summaries.shutdown(wait=True)